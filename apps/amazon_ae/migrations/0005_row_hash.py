@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('amazon_ae', '0004_amazonorder_automated_shipping_settings_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='amazoninventory',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='amazonproduct',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+    ]
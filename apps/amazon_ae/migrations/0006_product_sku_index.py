@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('amazon_ae', '0005_row_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='amazonproduct',
+            name='sku',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('amazon_ae', '0006_product_sku_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='amazonorderitem',
+            name='product',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_items', to='amazon_ae.amazonproduct'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('amazon_ae', '0007_order_item_product'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='amazonorder',
+            index=models.Index(fields=['user', 'purchase_date', 'id'], name='amz_order_user_purchase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='amazonorder',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='amz_order_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='amazonorder',
+            index=models.Index(fields=['user', 'order_status', 'purchase_date'], name='amz_order_user_status_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('amazon_ae', '0008_order_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='amazonproduct',
+            index=models.Index(fields=['user', 'id'], name='amz_product_user_id_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('amazon_ae', '0009_product_page_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='amazoninventory',
+            index=models.Index(fields=['user', 'last_updated_time', 'id'], name='amz_inv_user_updated_idx'),
+        ),
+    ]
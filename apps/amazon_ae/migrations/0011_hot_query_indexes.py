@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('amazon_ae', '0010_inventory_updated_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='amazonorder',
+            name='amz_order_user_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='amazonorder',
+            index=models.Index(fields=['user', 'order_status', 'purchase_date', 'id'], name='amz_order_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='amazonproduct',
+            index=models.Index(fields=['asin'], name='amz_product_asin_idx'),
+        ),
+    ]
@@ -1,10 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
+from decimal import Decimal
+from apps.common.models import DataVersionModel, OrderItemTotalsModel, RowHashModel
+
+class AmazonProduct(RowHashModel):
+    data_version_marketplace = 'amazon'
 
-class AmazonProduct(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='amazon_products')
     asin = models.CharField(max_length=50, default='')
-    sku = models.CharField(max_length=100)
+    sku = models.CharField(max_length=100, db_index=True)
     title = models.CharField(max_length=500)
     description = models.TextField(blank=True, default='') 
     brand = models.CharField(max_length=200, blank=True)
@@ -55,10 +59,20 @@ class AmazonProduct(models.Model):
     variant_group_info = models.JSONField(default=dict, blank=True)
     marketplace_ids = models.JSONField(default=list, blank=True)
 
+    class Meta:
+        indexes = [
+            # Catalog pageToken pages: WHERE user_id = ? AND id > ? ORDER BY id
+            models.Index(fields=['user', 'id'], name='amz_product_user_id_idx'),
+            # Upload upserts key products by asin; also the identifiers filter
+            models.Index(fields=['asin'], name='amz_product_asin_idx'),
+        ]
+
     def __str__(self):
         return f"{self.asin} - {self.title}"
 
-class AmazonOrder(models.Model):
+class AmazonOrder(DataVersionModel):
+    data_version_marketplace = 'amazon'
+
     ORDER_STATUS_CHOICES = [
         ('Pending', 'Pending'),
         ('Unshipped', 'Unshipped'),
@@ -67,6 +81,9 @@ class AmazonOrder(models.Model):
         ('Cancelled', 'Cancelled'),
         ('Returned', 'Returned'),
     ]
+    # Item quantities count as shipped or unshipped by the order's status
+    SHIPPED_STATUSES = ['Shipped', 'Delivered']
+    UNSHIPPED_STATUSES = ['Pending', 'Processing']
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='amazon_orders')
     amazon_order_id = models.CharField(max_length=50, unique=True)
@@ -100,11 +117,24 @@ class AmazonOrder(models.Model):
     
     purchase_order_id = models.CharField(max_length=100, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # getOrders keyset pages and CreatedAfter/CreatedBefore ranges
+            models.Index(fields=['user', 'purchase_date', 'id'], name='amz_order_user_purchase_idx'),
+            models.Index(fields=['user', 'updated_at', 'id'], name='amz_order_user_updated_idx'),
+            # OrderStatuses pages, in the same (purchase_date, id) key order
+            models.Index(fields=['user', 'order_status', 'purchase_date', 'id'], name='amz_order_user_status_idx'),
+        ]
+
     def __str__(self):
         return self.amazon_order_id
 
-class AmazonOrderItem(models.Model):
+class AmazonOrderItem(OrderItemTotalsModel):
+    data_version_marketplace = 'amazon'
+
     order = models.ForeignKey(AmazonOrder, on_delete=models.CASCADE, related_name='items')
+    # Product the SKU resolved to; NULL until the next relationship repair
+    product = models.ForeignKey(AmazonProduct, on_delete=models.SET_NULL, null=True, blank=True, related_name='order_items')
     order_item_id = models.CharField(max_length=50, unique=True)
     asin = models.CharField(max_length=50)
     sku = models.CharField(max_length=100)
@@ -132,7 +162,19 @@ class AmazonOrderItem(models.Model):
     def __str__(self):
         return f"{self.order_item_id} - {self.title}"
 
-class AmazonInventory(models.Model):
+    def order_totals(self):
+        # Same rule as AMAZON_ORDER_TOTALS, so deltas and recomputes agree
+        quantity = int(self.quantity_ordered or 0)
+        status = self.order.order_status
+        return {
+            'order_total_amount': Decimal(str(self.item_price_amount or 0)) * quantity,
+            'number_of_items_shipped': quantity if status in AmazonOrder.SHIPPED_STATUSES else 0,
+            'number_of_items_unshipped': quantity if status in AmazonOrder.UNSHIPPED_STATUSES else 0,
+        }
+
+class AmazonInventory(RowHashModel):
+    data_version_marketplace = 'amazon'
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='amazon_inventory')
     asin = models.CharField(max_length=50)
     sku = models.CharField(max_length=100)
@@ -148,6 +190,10 @@ class AmazonInventory(models.Model):
 
     class Meta:
         unique_together = ['user', 'sku']
+        indexes = [
+            # Inventory summary pages and startDateTime change feeds
+            models.Index(fields=['user', 'last_updated_time', 'id'], name='amz_inv_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sku} - {self.available_quantity}"
\ No newline at end of file
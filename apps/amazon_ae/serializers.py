@@ -4,12 +4,19 @@ from .models import AmazonProduct, AmazonOrder, AmazonOrderItem, AmazonInventory
 class AmazonProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = AmazonProduct
-        fields = '__all__'
+        exclude = ['row_hash']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        # Optional subset of fields to render, e.g. the catalog's includedData
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 class AmazonOrderItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = AmazonOrderItem
-        fields = '__all__'
+        exclude = ['product']
 
 class AmazonOrderSerializer(serializers.ModelSerializer):
     items = AmazonOrderItemSerializer(many=True, read_only=True)
@@ -21,4 +28,4 @@ class AmazonOrderSerializer(serializers.ModelSerializer):
 class AmazonInventorySerializer(serializers.ModelSerializer):
     class Meta:
         model = AmazonInventory
-        fields = '__all__'
\ No newline at end of file
+        exclude = ['row_hash']
\ No newline at end of file
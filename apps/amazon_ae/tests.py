@@ -0,0 +1,144 @@
+from datetime import datetime, timezone as dt_timezone
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.authentication.models import MarketplaceCredential
+from apps.common.pagination import encode_token
+from apps.data_upload.models import DataVersion
+from .models import AmazonInventory, AmazonOrder, AmazonOrderItem, AmazonProduct
+
+class AmazonApiTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('seller', password='x')
+        credential = MarketplaceCredential.objects.create(
+            user=self.user, marketplace='AMAZON_AE', client_id='cid', client_secret='secret')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {credential.generate_access_token()}')
+
+class OrderNextTokenTests(AmazonApiTestCase):
+    def assertInvalidToken(self, token):
+        response = self.client.get('/api/amazon-ae/orders/', {'NextToken': token})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['code'], 'InvalidInput')
+
+    def test_undecodable_token(self):
+        self.assertInvalidToken('not a token')
+
+    def test_token_with_wrong_shape(self):
+        self.assertInvalidToken(encode_token([1, 2]))
+        self.assertInvalidToken(encode_token({'q': [], 'after': ['2024-01-01T00:00:00Z', 1]}))
+        self.assertInvalidToken(encode_token({'q': 'CreatedAfter', 'after': ['2024-01-01T00:00:00Z', 1]}))
+        self.assertInvalidToken(encode_token({'q': {}, 'after': 'x'}))
+        self.assertInvalidToken(encode_token({'q': {}, 'after': [1]}))
+        self.assertInvalidToken(encode_token({'q': {'OrderStatuses': ['Shipped']}, 'after': ['2024-01-01T00:00:00Z', 1]}))
+
+    def test_well_formed_token(self):
+        token = encode_token({'q': {'OrderStatuses': 'Shipped'}, 'after': ['2024-01-01T00:00:00Z', 1]})
+        response = self.client.get('/api/amazon-ae/orders/', {'NextToken': token})
+        self.assertEqual(response.status_code, 200)
+
+class InventoryNextTokenTests(AmazonApiTestCase):
+    def test_token_with_wrong_shape(self):
+        for token in (encode_token('x'), encode_token({'q': ['sellerSkus'], 'after': ['2024-01-01T00:00:00Z', 1]})):
+            response = self.client.get('/api/amazon-ae/fba/inventory/', {'nextToken': token})
+            self.assertEqual(response.status_code, 400)
+
+class InventorySummaryTests(AmazonApiTestCase):
+    def test_last_updated_time_in_utc_z_form(self):
+        item = AmazonInventory.objects.create(user=self.user, asin='A1', sku='S1', product_name='Item')
+        AmazonInventory.objects.filter(pk=item.pk).update(last_updated_time=datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc))
+        summary = self.client.get('/api/amazon-ae/fba/inventory/').json()['payload']['inventorySummaries'][0]
+        self.assertEqual(summary['lastUpdatedTime'], '2024-05-01T08:30:15Z')
+
+class ETagTests(AmazonApiTestCase):
+    url = '/api/amazon-ae/orders/'
+
+    def setUp(self):
+        super().setUp()
+        self.order = AmazonOrder.objects.create(
+            user=self.user, amazon_order_id='O1', purchase_date=timezone.now(),
+            order_status='Shipped', order_total_amount=0)
+
+    def assertChangesETag(self, write):
+        etag = self.client.get(self.url)['ETag']
+        write()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_unchanged_data_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_order_save(self):
+        def write():
+            self.order.order_status = 'Delivered'
+            self.order.save()
+        self.assertChangesETag(write)
+
+    def test_order_item_save(self):
+        self.assertChangesETag(lambda: AmazonOrderItem.objects.create(
+            order=self.order, order_item_id='I1', asin='A1', sku='S1', title='Item',
+            quantity_ordered=1, item_price_amount=5))
+
+    def test_if_none_match_takes_precedence_over_if_modified_since(self):
+        response = self.client.get(self.url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        # A write within the same second leaves Last-Modified unchanged
+        AmazonOrder.objects.filter(pk=self.order.pk).update(order_status='Delivered')
+        DataVersion.objects.filter(user=self.user, marketplace='amazon').update(version=F('version') + 1)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+
+    def test_restarted_version_counter(self):
+        def write():
+            version = DataVersion.objects.get(user=self.user, marketplace='amazon')
+            DataVersion.objects.filter(pk=version.pk).delete()
+            DataVersion.objects.create(user=self.user, marketplace='amazon', version=version.version)
+        self.assertChangesETag(write)
+
+class OrderItemTotalsTests(AmazonApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.order = AmazonOrder.objects.create(
+            user=self.user, amazon_order_id='O1', purchase_date=timezone.now(),
+            order_status='Delivered', order_total_amount=0)
+
+    def test_item_save_counts_delivered_items_as_shipped(self):
+        AmazonOrderItem.objects.create(
+            order=self.order, order_item_id='I1', asin='A1', sku='S1', title='Item',
+            quantity_ordered=3, item_price_amount=5)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.order_total_amount, 15)
+        self.assertEqual((self.order.number_of_items_shipped, self.order.number_of_items_unshipped), (3, 0))
+
+    def test_item_save_moves_order_into_last_updated_after(self):
+        since = timezone.now()
+        AmazonOrderItem.objects.create(
+            order=self.order, order_item_id='I1', asin='A1', sku='S1', title='Item',
+            quantity_ordered=1, item_price_amount=5)
+        response = self.client.get('/api/amazon-ae/orders/', {'LastUpdatedAfter': since.isoformat()})
+        self.assertEqual([order['AmazonOrderId'] for order in response.json()['payload']['Orders']], ['O1'])
+
+class CatalogPageSizeTests(AmazonApiTestCase):
+    def test_page_size_capped_at_twenty(self):
+        AmazonProduct.objects.bulk_create([
+            AmazonProduct(user=self.user, asin=f'A{i}', sku=f'S{i}', title='Item', category='Toys', price=1)
+            for i in range(25)
+        ])
+        response = self.client.get('/api/amazon-ae/catalog/items/', {'pageSize': 1000})
+        self.assertEqual(len(response.json()['payload']['items']), 20)
+        self.assertIsNotNone(response.json()['pagination']['nextToken'])
+
+class CachedCountTests(AmazonApiTestCase):
+    def test_restarted_version_counter_recounts(self):
+        AmazonProduct.objects.create(user=self.user, asin='A1', sku='S1', title='One', category='Toys', price=1)
+        url = '/api/amazon-ae/catalog/items/'
+        self.assertEqual(self.client.get(url).json()['payload']['numberOfResults'], 1)
+
+        # Rows and version row replaced, counter back at the same number
+        version = DataVersion.objects.get(user=self.user, marketplace='amazon')
+        AmazonProduct.objects.all().delete()
+        DataVersion.objects.filter(pk=version.pk).delete()
+        DataVersion.objects.create(user=self.user, marketplace='amazon', version=version.version)
+        self.assertEqual(self.client.get(url).json()['payload']['numberOfResults'], 0)
@@ -10,10 +10,121 @@ from .serializers import (
     AmazonProductSerializer, AmazonOrderSerializer, 
     AmazonOrderItemSerializer, AmazonInventorySerializer
 )
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from apps.common.views import ConditionalGetMixin
+from apps.common.pagination import InvalidToken, cached_count, decode_token, encode_token, keyset_page
+from apps.data_upload.versions import get_data_version
 from datetime import datetime, timedelta
 import base64
 
-class AmazonProductViewSet(viewsets.ReadOnlyModelViewSet):
+# getOrders pages newest first; id breaks ties between equal purchase dates
+ORDER_ORDERING = ['-purchase_date', '-id']
+
+# Columns the order list emits; read with values() so no model instances,
+# raw_data blobs or items are loaded for a page
+ORDER_LIST_FIELDS = ['id', 'amazon_order_id', 'purchase_date', 'updated_at', 'order_status', 'fulfillment_channel', 'order_total_amount', 'buyer_email', 'buyer_name']
+INVENTORY_LIST_FIELDS = ['id', 'asin', 'fn_sku', 'sku', 'condition', 'product_name', 'last_updated_time', 'total_quantity', 'available_quantity', 'pending_quantity', 'reserved_quantity']
+
+# SP-API query parameter -> (lookup, kind)
+ORDER_FILTERS = {
+    'CreatedAfter': ('purchase_date__gte', 'datetime'),
+    'CreatedBefore': ('purchase_date__lt', 'datetime'),
+    'LastUpdatedAfter': ('updated_at__gte', 'datetime'),
+    'LastUpdatedBefore': ('updated_at__lt', 'datetime'),
+    'OrderStatuses': ('order_status__in', 'list'),
+    'FulfillmentChannels': ('fulfillment_channel__in', 'list'),
+    'MaxResultsPerPage': (None, None),
+}
+
+# Catalog includedData group -> product columns it loads and renders
+CATALOG_INCLUDED_DATA = {
+    'identifiers': ['asin', 'sku', 'product_id', 'wpid'],
+    'summaries': ['title', 'product_title', 'brand', 'brand_name', 'manufacturer_name', 'category', 'price', 'currency', 'quantity', 'status', 'created_at', 'updated_at'],
+    'attributes': ['attributes', 'features', 'description', 'product_description', 'pack_size'],
+    'images': ['image_url', 'image_urls'],
+    'productTypes': ['product_type', 'marketplace_ids'],
+    'relationships': ['variant_group_info', 'is_duplicate'],
+    'salesRanks': ['listing_quality_score', 'page_views', 'sessions', 'refund'],
+    'fees': ['total_cogs', 'product_cost', 'referral_fee', 'cogs', 'shipping_cost', 'a_shipping_cost', 'channel_fee', 'fullfillment_by_channel_fee'],
+    'fulfillment': ['fullfillment_by_channel', 'will_ship_internationally', 'new_product'],
+    'rawData': ['raw_data'],
+}
+CATALOG_DEFAULT_INCLUDED_DATA = ['summaries']
+CATALOG_ALWAYS_INCLUDED = ['id', 'asin', 'sku']
+CATALOG_ORDERING = ['id']
+# searchCatalogItems returns at most 20 items a page, larger pageSizes are capped
+CATALOG_MAX_PAGE_SIZE = 20
+
+# FBA inventory summaries stream in change order, 50 per page like SP-API
+INVENTORY_ORDERING = ['last_updated_time', 'id']
+INVENTORY_PAGE_SIZE = 50
+INVENTORY_FILTERS = ['sellerSkus', 'startDateTime']
+MAX_SELLER_SKUS = 50
+
+def invalid_input(message):
+    return {'errors': [{'code': 'InvalidInput', 'message': message}]}
+
+def parse_iso_datetime(name, value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'{name} must be an ISO 8601 date-time')
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed, timezone.utc)
+
+def decode_query_token(token, filters, ordering):
+    """
+    Query parameters and last ordering values carried by a next-page token.
+    Anything but the shape this API issues is rejected like an undecodable token.
+    """
+    state = decode_token(token)
+    params = state.get('q') if isinstance(state, dict) else None
+    after = state.get('after') if isinstance(state, dict) else None
+    if not isinstance(params, dict) or not isinstance(after, list) or len(after) != len(ordering):
+        raise InvalidToken('Invalid pagination token')
+    if any(name not in filters or not isinstance(value, str) for name, value in params.items()):
+        raise InvalidToken('Invalid pagination token')
+    return params, after
+
+def filter_orders(queryset, params):
+    """Apply getOrders query parameters to an order queryset"""
+    if params.get('CreatedAfter') and params.get('LastUpdatedAfter'):
+        raise ValueError('CreatedAfter and LastUpdatedAfter cannot both be specified')
+    for name, value in params.items():
+        lookup, kind = ORDER_FILTERS.get(name, (None, None))
+        if lookup is None:
+            continue
+        if kind == 'datetime':
+            value = parse_iso_datetime(name, value)
+        else:
+            value = [v.strip() for v in value.split(',') if v.strip()]
+        queryset = queryset.filter(**{lookup: value})
+    return queryset
+
+def format_order(order):
+    """getOrders entry for a row of ``ORDER_LIST_FIELDS``"""
+    return {
+        'AmazonOrderId': order['amazon_order_id'],
+        'PurchaseDate': order['purchase_date'],
+        'LastUpdateDate': order['updated_at'],
+        'OrderStatus': order['order_status'],
+        'FulfillmentChannel': order['fulfillment_channel'],
+        'OrderTotal': {'CurrencyCode': 'AED', 'Amount': str(order['order_total_amount'])},
+        'BuyerInfo': {'BuyerEmail': order['buyer_email'], 'BuyerName': order['buyer_name']}
+    }
+
+def filter_inventory(queryset, params):
+    """Apply getInventorySummaries query parameters to an inventory queryset"""
+    if params.get('sellerSkus'):
+        skus = [sku.strip() for sku in params['sellerSkus'].split(',') if sku.strip()]
+        if len(skus) > MAX_SELLER_SKUS:
+            raise ValueError(f'sellerSkus accepts at most {MAX_SELLER_SKUS} SKUs')
+        queryset = queryset.filter(sku__in=skus)
+    if params.get('startDateTime'):
+        queryset = queryset.filter(last_updated_time__gte=parse_iso_datetime('startDateTime', params['startDateTime']))
+    return queryset
+
+class AmazonProductViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    data_version_marketplace = 'amazon'
     serializer_class = AmazonProductSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [SearchFilter]
@@ -42,16 +153,33 @@ class AmazonProductViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
     
     def list(self, request, *args, **kwargs):
+        # As in SP-API, a pageToken is sent along with the original query parameters
+        included = request.query_params.get('includedData')
+        groups = [g.strip() for g in included.split(',') if g.strip()] if included else CATALOG_DEFAULT_INCLUDED_DATA
+        unknown = [g for g in groups if g not in CATALOG_INCLUDED_DATA]
+        if unknown:
+            return Response(invalid_input(f"Unknown includedData: {', '.join(unknown)}"), status=status.HTTP_400_BAD_REQUEST)
+        fields = list(dict.fromkeys(CATALOG_ALWAYS_INCLUDED + [f for g in groups for f in CATALOG_INCLUDED_DATA[g]]))
+
         queryset = self.filter_queryset(self.get_queryset())
-        page_size = int(request.query_params.get('pageSize', 20))
-        items = queryset[:page_size]
-        serializer = self.get_serializer(items, many=True)
+        token = request.query_params.get('pageToken')
+        try:
+            page_size = int(request.query_params.get('pageSize', CATALOG_MAX_PAGE_SIZE))
+            if page_size < 1:
+                raise ValueError('pageSize must be at least 1')
+            page_size = min(page_size, CATALOG_MAX_PAGE_SIZE)
+            items, last = keyset_page(queryset.only(*fields), CATALOG_ORDERING, page_size, decode_token(token) if token else None)
+        except ValueError as e:
+            return Response(invalid_input(str(e)), status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(items, many=True, fields=fields)
         return Response({
-            'payload': {'items': serializer.data, 'numberOfResults': queryset.count()},
-            'pagination': {'nextToken': None}
+            'payload': {'items': serializer.data, 'numberOfResults': cached_count(queryset, get_data_version(request.user, 'amazon'))},
+            'pagination': {'nextToken': encode_token(last) if last else None}
         })
 
-class AmazonOrderViewSet(viewsets.ReadOnlyModelViewSet):
+class AmazonOrderViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    data_version_marketplace = 'amazon'
     serializer_class = AmazonOrderSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'amazon_order_id'
@@ -61,28 +189,31 @@ class AmazonOrderViewSet(viewsets.ReadOnlyModelViewSet):
         if self.request.auth.marketplace != 'AMAZON_AE':
             raise PermissionDenied("This token is restricted to Amazon AE endpoints.")
             
-        return AmazonOrder.objects.filter(user=self.request.user).prefetch_related('items').order_by('-purchase_date')
+        return AmazonOrder.objects.filter(user=self.request.user).prefetch_related('items').order_by(*ORDER_ORDERING)
     
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        max_results = int(request.query_params.get('MaxResultsPerPage', 100))
-        orders = queryset[:max_results]
-        serializer = self.get_serializer(orders, many=True)
-        
-        formatted_orders = []
-        for order_data in serializer.data:
-            formatted_orders.append({
-                'AmazonOrderId': order_data['amazon_order_id'],
-                'PurchaseDate': order_data['purchase_date'],
-                'OrderStatus': order_data['order_status'],
-                'OrderTotal': {'CurrencyCode': 'AED', 'Amount': str(order_data['order_total_amount'])},
-                'BuyerInfo': {'BuyerEmail': order_data.get('buyer_email', ''), 'BuyerName': order_data.get('buyer_name', '')}
-            })
-        
+        # A NextToken carries the original filters, like SP-API's does
+        token = request.query_params.get('NextToken')
+        try:
+            if token:
+                params, after = decode_query_token(token, ORDER_FILTERS, ORDER_ORDERING)
+            else:
+                params = {name: request.query_params[name] for name in ORDER_FILTERS if request.query_params.get(name)}
+                after = None
+            queryset = filter_orders(self.get_queryset().prefetch_related(None), params).values(*ORDER_LIST_FIELDS)
+            max_results = int(params.get('MaxResultsPerPage', 100))
+            if max_results < 1:
+                raise ValueError('MaxResultsPerPage must be at least 1')
+            orders, last = keyset_page(queryset, ORDER_ORDERING, max_results, after)
+        except (InvalidToken, KeyError, TypeError) as e:
+            return Response(invalid_input(f'Invalid NextToken: {e}'), status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response(invalid_input(str(e)), status=status.HTTP_400_BAD_REQUEST)
+
         return Response({
             'payload': {
-                'Orders': formatted_orders, 
-                'NextToken': None,
+                'Orders': [format_order(order) for order in orders],
+                'NextToken': encode_token({'q': params, 'after': last}) if last else None,
                 'LastUpdatedBefore': datetime.now().isoformat() + 'Z'
             }
         })
@@ -90,17 +221,18 @@ class AmazonOrderViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['get'], url_path='orderItems')
     def order_items(self, request, amazon_order_id=None):
         order = self.get_object()
-        items = AmazonOrderItem.objects.filter(order=order)
+        items = AmazonOrderItem.objects.filter(order=order).values('asin', 'sku', 'order_item_id', 'title', 'quantity_ordered', 'item_price_amount')
         formatted_items = []
         for item in items:
             formatted_items.append({
-                'ASIN': item.asin, 'SellerSKU': item.sku, 'OrderItemId': item.order_item_id,
-                'Title': item.title, 'QuantityOrdered': item.quantity_ordered,
-                'ItemPrice': {'CurrencyCode': 'AED', 'Amount': str(item.item_price_amount)}
+                'ASIN': item['asin'], 'SellerSKU': item['sku'], 'OrderItemId': item['order_item_id'],
+                'Title': item['title'], 'QuantityOrdered': item['quantity_ordered'],
+                'ItemPrice': {'CurrencyCode': 'AED', 'Amount': str(item['item_price_amount'])}
             })
         return Response({'payload': {'AmazonOrderId': order.amazon_order_id, 'OrderItems': formatted_items}})
 
-class AmazonInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class AmazonInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    data_version_marketplace = 'amazon'
     serializer_class = AmazonInventorySerializer
     permission_classes = [IsAuthenticated]
     
@@ -111,12 +243,34 @@ class AmazonInventoryViewSet(viewsets.ReadOnlyModelViewSet):
         return AmazonInventory.objects.filter(user=self.request.user)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        items = queryset[:50]
+        # A nextToken carries the original filters, like getOrders
+        token = request.query_params.get('nextToken')
+        try:
+            if token:
+                params, after = decode_query_token(token, INVENTORY_FILTERS, INVENTORY_ORDERING)
+            else:
+                params = {name: request.query_params[name] for name in INVENTORY_FILTERS if request.query_params.get(name)}
+                after = None
+            queryset = filter_inventory(self.filter_queryset(self.get_queryset()), params).values(*INVENTORY_LIST_FIELDS)
+            items, last = keyset_page(queryset, INVENTORY_ORDERING, INVENTORY_PAGE_SIZE, after)
+        except (InvalidToken, KeyError, TypeError) as e:
+            return Response(invalid_input(f'Invalid nextToken: {e}'), status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response(invalid_input(str(e)), status=status.HTTP_400_BAD_REQUEST)
+
         formatted = []
         for item in items:
             formatted.append({
-                'asin': item.asin, 'sellerSku': item.sku, 'productName': item.product_name,
-                'inventoryDetails': {'fulfillableQuantity': item.available_quantity}
+                'asin': item['asin'], 'fnSku': item['fn_sku'], 'sellerSku': item['sku'], 'condition': item['condition'],
+                'productName': item['product_name'], 'lastUpdatedTime': item['last_updated_time'].strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'totalQuantity': item['total_quantity'],
+                'inventoryDetails': {
+                    'fulfillableQuantity': item['available_quantity'],
+                    'inboundReceivingQuantity': item['pending_quantity'],
+                    'reservedQuantity': {'totalReservedQuantity': item['reserved_quantity']},
+                }
             })
-        return Response({'payload': {'inventorySummaries': formatted}, 'pagination': {'nextToken': None}})
\ No newline at end of file
+        return Response({
+            'payload': {'inventorySummaries': formatted},
+            'pagination': {'nextToken': encode_token({'q': params, 'after': last}) if last else None}
+        })
@@ -1,6 +1,7 @@
 from rest_framework import authentication
 from rest_framework import exceptions
-from .models import MarketplaceCredential
+from .models import MarketplaceCredential, hash_token
+from .token_cache import token_cache
 from django.utils import timezone
 
 class MarketplaceTokenAuthentication(authentication.BaseAuthentication):
@@ -10,17 +11,27 @@ class MarketplaceTokenAuthentication(authentication.BaseAuthentication):
             return None
 
         token = auth_header.split(' ')[1]
+        key = hash_token(token)
 
-        try:
-            credential = MarketplaceCredential.objects.get(
-                access_token=token,
-                is_active=True
-            )
-            
-            if credential.token_expires_at and credential.token_expires_at < timezone.now():
-                raise exceptions.AuthenticationFailed('Token expired')
-            
-            return (credential.user, credential)
-            
-        except MarketplaceCredential.DoesNotExist:
-            raise exceptions.AuthenticationFailed('Invalid token')
\ No newline at end of file
+        # A cache hit costs no database round trip at all
+        credential = token_cache.get(key)
+        if credential is None:
+            try:
+                credential = MarketplaceCredential.objects.select_related('user').get(
+                    access_token_hash=key,
+                    is_active=True
+                )
+            except MarketplaceCredential.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Invalid token')
+            cached = False
+        else:
+            cached = True
+
+        if credential.token_expires_at and credential.token_expires_at < timezone.now():
+            token_cache.forget(key)
+            raise exceptions.AuthenticationFailed('Token expired')
+
+        # Only a fresh read is cached, so a hit never extends the entry's expiry
+        if not cached:
+            token_cache.set(key, credential)
+        return (credential.user, credential)
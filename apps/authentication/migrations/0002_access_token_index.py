@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marketplacecredential',
+            index=models.Index(fields=['access_token'], name='credential_access_token_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+import hashlib
+from django.db import migrations, models
+
+
+def hash_access_tokens(apps, schema_editor):
+    MarketplaceCredential = apps.get_model('authentication', 'MarketplaceCredential')
+    for credential in MarketplaceCredential.objects.exclude(access_token__isnull=True).exclude(access_token=''):
+        credential.access_token_hash = hashlib.sha256(credential.access_token.encode()).hexdigest()
+        credential.save(update_fields=['access_token_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_access_token_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='marketplacecredential',
+            name='access_token_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(hash_access_tokens, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='marketplacecredential',
+            name='credential_access_token_idx',
+        ),
+        migrations.RemoveField(
+            model_name='marketplacecredential',
+            name='access_token',
+        ),
+        migrations.AddIndex(
+            model_name='marketplacecredential',
+            index=models.Index(fields=['access_token_hash'], name='credential_token_hash_idx'),
+        ),
+    ]
@@ -1,8 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
+import hashlib
 import secrets
 from django.utils import timezone
 from datetime import datetime, timedelta
+from .token_cache import token_cache
+
+def hash_token(token):
+    """Only this digest of an access token is stored"""
+    return hashlib.sha256(token.encode()).hexdigest()
 
 class MarketplaceCredential(models.Model):
     MARKETPLACE_CHOICES = [
@@ -14,7 +20,7 @@ class MarketplaceCredential(models.Model):
     marketplace = models.CharField(max_length=20, choices=MARKETPLACE_CHOICES)
     client_id = models.CharField(max_length=100, unique=True)
     client_secret = models.CharField(max_length=200)
-    access_token = models.TextField(blank=True, null=True)
+    access_token_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
     refresh_token = models.TextField(blank=True, null=True)
     token_expires_at = models.DateTimeField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
@@ -23,6 +29,10 @@ class MarketplaceCredential(models.Model):
 
     class Meta:
         unique_together = ['user', 'marketplace']
+        indexes = [
+            # Bearer token lookup on every authenticated request
+            models.Index(fields=['access_token_hash'], name='credential_token_hash_idx'),
+        ]
 
     def generate_credentials(self):
         self.client_id = f"{self.marketplace.lower()}_{secrets.token_urlsafe(16)}"
@@ -30,10 +40,21 @@ class MarketplaceCredential(models.Model):
         self.save()
 
     def generate_access_token(self):
-        self.access_token = secrets.token_urlsafe(64)
+        token = secrets.token_urlsafe(64)
+        self.access_token_hash = hash_token(token)
         self.token_expires_at = timezone.now() + timedelta(hours=24)
         self.save()
-        return self.access_token
+        return token
+
+    def save(self, *args, **kwargs):
+        # A new token, deactivation or any other change retires the cached
+        # copy; other workers drop theirs within TOKEN_CACHE_TTL
+        super().save(*args, **kwargs)
+        token_cache.forget_credential(self.pk)
+
+    def delete(self, *args, **kwargs):
+        token_cache.forget_credential(self.pk)
+        return super().delete(*args, **kwargs)
 
     def verify_secret(self, secret):
         return self.client_secret == secret
\ No newline at end of file
@@ -0,0 +1,43 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from rest_framework import exceptions
+from .authentication import MarketplaceTokenAuthentication
+from .models import MarketplaceCredential
+from .token_cache import token_cache
+
+class TokenCacheExpiryTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        user = User.objects.create_user('seller', password='x')
+        self.credential = MarketplaceCredential.objects.create(
+            user=user, marketplace='AMAZON_AE', client_id='cid', client_secret='secret')
+        self.token = self.credential.generate_access_token()
+        self.request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def authenticate(self):
+        return MarketplaceTokenAuthentication().authenticate(self.request)
+
+    def test_deactivated_credential_rejected_after_ttl_under_polling(self):
+        now = [1000.0]
+        with mock.patch('apps.authentication.token_cache.time.monotonic', lambda: now[0]), \
+                mock.patch.object(token_cache, 'ttl', 1):
+            self.authenticate()
+            # Another worker deactivates it: this process's cache is not told
+            MarketplaceCredential.objects.filter(pk=self.credential.pk).update(is_active=False)
+            for _ in range(6):
+                now[0] += 0.5
+                if now[0] < 1001.0:
+                    self.authenticate()
+                else:
+                    with self.assertRaises(exceptions.AuthenticationFailed):
+                        self.authenticate()
+
+class CacheStatsAccessTests(TestCase):
+    def test_staff_only(self):
+        self.assertEqual(self.client.get('/cache-stats/').status_code, 302)
+        self.client.force_login(User.objects.create_user('seller', password='x'))
+        self.assertEqual(self.client.get('/cache-stats/').status_code, 302)
+        self.client.force_login(User.objects.create_user('ops', password='x', is_staff=True))
+        self.assertEqual(self.client.get('/cache-stats/').status_code, 200)
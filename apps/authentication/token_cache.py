@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+
+class TokenCache:
+    """
+    Per-process LRU of token hash -> credential (with its user loaded).
+    Entries live at most ``ttl`` seconds, which bounds how long another
+    worker can keep honouring a token after it was replaced or revoked;
+    the worker that makes the change forgets it at once.
+    """
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            credential, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return credential
+
+    def set(self, key, credential):
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (credential, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def forget(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def forget_credential(self, pk):
+        """Drop every entry for the credential with primary key ``pk``"""
+        with self.lock:
+            for key in [key for key, (credential, _) in self.entries.items() if credential.pk == pk]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
@@ -1 +1,14 @@
-# Common admin if needed
\ No newline at end of file
+from django.contrib import admin
+from django.db import transaction
+from apps.data_upload.versions import bump_data_version
+
+class DataVersionAdmin(admin.ModelAdmin):
+    """
+    Admin for DataVersionModel rows. Single edits bump the version in the
+    model's save() and delete(); the bulk delete action bypasses those, so
+    it bumps every user's version in the model's marketplace instead.
+    """
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            bump_data_version(None, queryset.model.data_version_marketplace)
@@ -0,0 +1,82 @@
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from apps.amazon_ae.views import format_order
+from apps.common.renderers import ORJSONRenderer
+
+class Command(BaseCommand):
+    help = "Compares DRF's JSONRenderer with ORJSONRenderer on order pages of increasing size"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000,10000', help='Comma separated orders per page')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options['sizes'].split(',')]
+        repeat = options['repeat']
+
+        self.stdout.write(f"{'PAGE':<6} | {'ORDERS':>7} | {'JSON MS':>9} | {'ORJSON MS':>9} | {'SPEEDUP':>7} | SAME")
+        self.stdout.write("=" * 58)
+        for size in sizes:
+            for name, page in [('amazon', self.amazon_page(size)), ('noon', self.noon_page(size))]:
+                stdlib, fast = JSONRenderer().render(page), ORJSONRenderer().render(page)
+                stdlib_ms = self.median_ms(lambda: JSONRenderer().render(page), repeat)
+                fast_ms = self.median_ms(lambda: ORJSONRenderer().render(page), repeat)
+                self.stdout.write(
+                    f"{name:<6} | {size:>7,} | {stdlib_ms:>9.2f} | {fast_ms:>9.2f} | {stdlib_ms / fast_ms:>6.1f}x | "
+                    f"{'✅' if stdlib == fast else '❌'}"
+                )
+
+    def amazon_page(self, size):
+        # The same structures getOrders renders: datetimes and Decimal strings
+        now = timezone.now()
+        return {
+            'payload': {
+                'Orders': [
+                    format_order({
+                        'amazon_order_id': f'402-{i:07d}-{i % 9973:07d}', 'purchase_date': now - timedelta(minutes=i),
+                        'updated_at': now, 'order_status': 'Shipped', 'fulfillment_channel': 'AFN',
+                        'order_total_amount': Decimal('123.45') + i, 'buyer_email': f'buyer{i}@example.com',
+                        'buyer_name': f'Buyer {i} ÅÉ',
+                    })
+                    for i in range(size)
+                ],
+                'NextToken': 'eyJxIjp7fSwiYWZ0ZXIiOltdfQ',
+                'LastUpdatedBefore': now.isoformat() + 'Z',
+            }
+        }
+
+    def noon_page(self, size):
+        # Nested items, floats, and values DRF's encoder converts (Decimal, UUID)
+        now = timezone.now()
+        return {
+            'success': True,
+            'data': {
+                'orders': [
+                    {
+                        'order_nr': f'NAE{i:09d}', 'order_date': (now - timedelta(minutes=i)).isoformat(), 'status': 'shipped',
+                        'customer': {'first_name': 'Customer', 'last_name': str(i)},
+                        'payment': {'total': {'value': 99.5 + i}}, 'reference': uuid.UUID(int=i),
+                        'items': [
+                            {'item_id': f'{i}-{n}', 'sku': f'PSKU-{n}', 'name': 'Item', 'quantity': n + 1, 'price': {'total_price': Decimal('33.17')}}
+                            for n in range(3)
+                        ],
+                    }
+                    for i in range(size)
+                ],
+                'pagination': {'page': 1, 'next_cursor': None, 'total_items': size},
+            }
+        }
+
+    def median_ms(self, fn, repeat):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(times)
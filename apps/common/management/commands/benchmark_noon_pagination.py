@@ -0,0 +1,70 @@
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.common.pagination import keyset_page
+from apps.noon_ae.models import NoonProduct
+from apps.noon_ae.views import PRODUCT_ORDERING
+
+class Command(BaseCommand):
+    help = 'Compares page-number (OFFSET) and cursor (keyset) latency of the Noon product list at increasing depth'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Products to seed')
+        parser.add_argument('--limit', type=int, default=100, help='Page size')
+        parser.add_argument('--pages', default='1,100,1000,10000', help='Comma separated page numbers to time')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        # A million seeded rows would bloat the configured database even when
+        # rolled back, so this runs against a throwaway test database instead.
+        self.stdout.write("🧪 Creating a temporary test database...")
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def benchmark(self, options):
+        rows, limit, repeat = options['rows'], options['limit'], options['repeat']
+        pages = [int(p) for p in options['pages'].split(',')]
+
+        # Seeded inside a rolled back transaction so no rows are left behind
+        with transaction.atomic():
+            user = User.objects.create(username='benchmark_noon_pagination')
+            self.stdout.write(f"🌱 Seeding {rows:,} products...")
+            start = time.perf_counter()
+            batch = 10_000
+            for first in range(0, rows, batch):
+                NoonProduct.objects.bulk_create([
+                    NoonProduct(user=user, noon_sku=f'N{i:09d}', partner_sku=f'PSKU-{i}', title=f'Benchmark product {i}', price=10)
+                    for i in range(first, min(first + batch, rows))
+                ])
+            self.stdout.write(f"   done in {time.perf_counter() - start:.1f}s\n")
+
+            queryset = NoonProduct.objects.filter(user=user)
+            self.stdout.write(f"{'PAGE':>8} | {'OFFSET MS':>10} | {'CURSOR MS':>10}")
+            self.stdout.write("=" * 34)
+            for page in pages:
+                offset = (page - 1) * limit
+                if offset >= rows:
+                    self.stdout.write(self.style.WARNING(f"{page:>8} | beyond the last page, skipped"))
+                    continue
+                # The cursor a client would hold after reading the previous page
+                after = [queryset.order_by(*PRODUCT_ORDERING).values_list('id', flat=True)[offset - 1]] if offset else None
+
+                offset_ms = self.median_ms(lambda: keyset_page(queryset, PRODUCT_ORDERING, limit, offset=offset), repeat)
+                cursor_ms = self.median_ms(lambda: keyset_page(queryset, PRODUCT_ORDERING, limit, after=after), repeat)
+                self.stdout.write(f"{page:>8,} | {offset_ms:>10.2f} | {cursor_ms:>10.2f}")
+
+            transaction.set_rollback(True)
+
+    def median_ms(self, fn, repeat):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(times)
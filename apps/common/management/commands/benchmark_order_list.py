@@ -0,0 +1,103 @@
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from apps.amazon_ae.models import AmazonOrder, AmazonOrderItem
+from apps.amazon_ae.serializers import AmazonOrderSerializer
+from apps.amazon_ae.views import ORDER_LIST_FIELDS, ORDER_ORDERING, format_order
+from apps.common.pagination import keyset_page
+
+class Command(BaseCommand):
+    help = 'Compares one Amazon getOrders page built from full serializers against the values() projection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=5000, help='Orders to seed')
+        parser.add_argument('--items', type=int, default=3, help='Items per order')
+        parser.add_argument('--page-size', type=int, default=100, help='Orders per page')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        # Seeded orders would otherwise churn the configured database even
+        # when rolled back, so this runs against a throwaway test database.
+        self.stdout.write("🧪 Creating a temporary test database...")
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def benchmark(self, options):
+        size, repeat = options['page_size'], options['repeat']
+
+        # Seeded inside a rolled back transaction so no rows are left behind
+        with transaction.atomic():
+            user = User.objects.create(username='benchmark_order_list')
+            self.seed(user, options['orders'], options['items'])
+            queryset = AmazonOrder.objects.filter(user=user)
+
+            def serializer_page():
+                # What the list did before: every column and every item
+                orders, _ = keyset_page(queryset.prefetch_related('items'), ORDER_ORDERING, size)
+                return [
+                    {
+                        'AmazonOrderId': data['amazon_order_id'],
+                        'PurchaseDate': data['purchase_date'],
+                        'LastUpdateDate': data['updated_at'],
+                        'OrderStatus': data['order_status'],
+                        'FulfillmentChannel': data['fulfillment_channel'],
+                        'OrderTotal': {'CurrencyCode': 'AED', 'Amount': str(data['order_total_amount'])},
+                        'BuyerInfo': {'BuyerEmail': data['buyer_email'], 'BuyerName': data['buyer_name']}
+                    }
+                    for data in AmazonOrderSerializer(orders, many=True).data
+                ]
+
+            def projection_page():
+                orders, _ = keyset_page(queryset.values(*ORDER_LIST_FIELDS), ORDER_ORDERING, size)
+                return [format_order(order) for order in orders]
+
+            same = JSONRenderer().render(serializer_page()) == JSONRenderer().render(projection_page())
+            self.stdout.write(f"{'PATH':<12} | {'MEDIAN MS':>10} | {'PEAK KIB':>10}")
+            self.stdout.write("=" * 38)
+            for name, build in [('serializer', serializer_page), ('projection', projection_page)]:
+                ms, kib = self.measure(build, repeat)
+                self.stdout.write(f"{name:<12} | {ms:>10.2f} | {kib:>10,.0f}")
+            style = self.style.SUCCESS if same else self.style.ERROR
+            self.stdout.write(style(f"{'✅' if same else '❌'} Rendered pages identical: {same}"))
+
+            transaction.set_rollback(True)
+
+    def seed(self, user, count, items):
+        now = timezone.now()
+        raw = {'note': 'x' * 2000, 'history': list(range(100))}
+        orders = AmazonOrder.objects.bulk_create([
+            AmazonOrder(
+                user=user, amazon_order_id=f'BENCH-{i:08d}', purchase_date=now - timedelta(minutes=i),
+                order_status='Shipped', order_total_amount=10 * items, raw_data=raw,
+            )
+            for i in range(count)
+        ])
+        AmazonOrderItem.objects.bulk_create([
+            AmazonOrderItem(
+                order=order, order_item_id=f'{order.amazon_order_id}-{n}', asin='B000BENCH', sku=f'SKU-{n}',
+                title='Benchmark item', quantity_ordered=1, item_price_amount=10, raw_data=raw,
+            )
+            for order in orders for n in range(items)
+        ])
+
+    def measure(self, build, repeat):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build()
+            times.append((time.perf_counter() - start) * 1000)
+        tracemalloc.start()
+        build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return statistics.median(times), peak / 1024
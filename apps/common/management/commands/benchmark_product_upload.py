@@ -0,0 +1,77 @@
+import time
+import pandas as pd
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.data_upload.ingest import upload_amazon_products, upload_noon_products
+
+class Command(BaseCommand):
+    help = 'Measures product upload throughput (rows/sec) for fresh, changed and repeated sheets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000',
+                            help='Comma separated row counts to benchmark')
+
+    def handle(self, *args, **options):
+        # Uploads claim rows by key from any other owner, so this never runs
+        # against the configured database: it gets a throwaway test database.
+        self.stdout.write("🧪 Creating a temporary test database...")
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def benchmark(self, options):
+        sizes = [int(s) for s in options['sizes'].split(',')]
+
+        self.stdout.write(f"{'MARKETPLACE':<12} | {'ROWS':>8} | {'PASS':<7} | {'SECONDS':>8} | {'ROWS/SEC':>10}")
+        self.stdout.write("=" * 58)
+        for size in sizes:
+            for name, upload, make_df in [
+                ('amazon', upload_amazon_products, self.amazon_df),
+                ('noon', upload_noon_products, self.noon_df),
+            ]:
+                df = make_df(size)
+                # Every price changes between the first two passes, so the
+                # second one rewrites each row instead of skipping it as
+                # unchanged; the third repeats it to time that shortcut.
+                changed = df.assign(price=df['price'] + 1)
+                # Runs in a rolled back transaction so no rows are left behind
+                with transaction.atomic():
+                    user = User.objects.create(username=f'benchmark_{name}_{size}')
+                    for label, sheet in (('create', df), ('update', changed), ('same', changed)):
+                        start = time.perf_counter()
+                        result = upload(sheet, user)
+                        elapsed = time.perf_counter() - start
+                        self.stdout.write(
+                            f"{name:<12} | {size:>8,} | {label:<7} | {elapsed:>8.2f} | {size / elapsed:>10,.0f}"
+                            f"  {result}"
+                        )
+                    transaction.set_rollback(True)
+
+    def amazon_df(self, size):
+        return pd.DataFrame({
+            'asin': [f'BENCH{i:08d}' for i in range(size)],
+            'sku': [f'SKU-{i}' for i in range(size)],
+            'title': [f'Benchmark product {i}' for i in range(size)],
+            'brand': 'Bench',
+            'category': 'General',
+            'price': [round(10 + i % 500 * 0.5, 2) for i in range(size)],
+            'quantity': [i % 100 for i in range(size)],
+            'status': 'ACTIVE',
+        })
+
+    def noon_df(self, size):
+        return pd.DataFrame({
+            'noon_sku': [f'N{i:09d}' for i in range(size)],
+            'partner_sku': [f'PSKU-{i}' for i in range(size)],
+            'title': [f'Benchmark product {i}' for i in range(size)],
+            'brand': 'Bench',
+            'category_code': 'general',
+            'product_type': 'item',
+            'price': [round(10 + i % 500 * 0.5, 2) for i in range(size)],
+            'stock_quantity': [i % 100 for i in range(size)],
+            'status': 'active',
+        })
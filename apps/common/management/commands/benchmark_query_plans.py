@@ -0,0 +1,162 @@
+import statistics
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.amazon_ae.models import AmazonProduct, AmazonOrder, AmazonInventory
+from apps.amazon_ae.views import ORDER_LIST_FIELDS, ORDER_ORDERING, INVENTORY_ORDERING
+from apps.authentication.models import MarketplaceCredential, hash_token
+from apps.common.pagination import keyset_filter
+from apps.noon_ae.models import NoonProduct, NoonOrder
+from apps.noon_ae.views import ORDER_ORDERING as NOON_ORDER_ORDERING, PRODUCT_ORDERING as NOON_PRODUCT_ORDERING
+
+# Models whose Meta.indexes back the hot queries; "before" drops them all
+INDEXED_MODELS = [AmazonProduct, AmazonOrder, AmazonInventory, NoonProduct, NoonOrder, MarketplaceCredential]
+
+class Command(BaseCommand):
+    help = 'Prints EXPLAIN plans and timings of the API hot queries without and with the composite indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Rows seeded per marketplace table')
+        parser.add_argument('--users', type=int, default=20, help='Users the rows are spread across')
+        parser.add_argument('--credentials', type=int, default=100_000, help='Credentials seeded for the token lookup')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        # Indexes are dropped and recreated, so this never runs against the
+        # configured database: it gets a throwaway test database instead.
+        self.stdout.write("🧪 Creating a temporary test database...")
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def benchmark(self, options):
+        rows, users, repeat = options['rows'], options['users'], options['repeat']
+        indexes = [(model, index) for model in INDEXED_MODELS for index in model._meta.indexes]
+        # SQLite's schema editor refuses to open inside a transaction, so
+        # the CREATE INDEX statements are rendered up front.
+        with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            create_sql = [str(index.create_sql(model, editor)) for model, index in indexes]
+
+        # Seeded inside a rolled back transaction so no rows are left behind
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for _, index in indexes:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+            self.stdout.write(f"🌱 Seeding {rows:,} rows per table across {users} users...")
+            start = time.perf_counter()
+            owners = self.seed(rows, users, options['credentials'])
+            self.stdout.write(f"   done in {time.perf_counter() - start:.1f}s")
+            queries = self.queries(owners[0], rows // users)
+
+            results = {}
+            for phase in ('before', 'after'):
+                if phase == 'after':
+                    with connection.cursor() as cursor:
+                        for sql in create_sql:
+                            cursor.execute(sql)
+                self.analyze()
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {phase.upper()}: {'with' if phase == 'after' else 'without'} the composite indexes ==="))
+                for name, build in queries:
+                    self.stdout.write(self.style.HTTP_INFO(f"\n{name}"))
+                    self.stdout.write(build().explain())
+                    results.setdefault(name, {})[phase] = self.median_ms(lambda: list(build()), repeat)
+
+            self.stdout.write(f"\n{'QUERY':<44} | {'BEFORE MS':>10} | {'AFTER MS':>9} | {'SPEEDUP':>8}")
+            self.stdout.write("=" * 80)
+            for name, timing in results.items():
+                self.stdout.write(
+                    f"{name:<44} | {timing['before']:>10.2f} | {timing['after']:>9.2f} | {timing['before'] / timing['after']:>7.1f}x"
+                )
+
+            transaction.set_rollback(True)
+
+    def seed(self, rows, users, credentials):
+        # One credential per user, so the token table gets its own users
+        accounts = User.objects.bulk_create([User(username=f'benchmark_plans_{u}') for u in range(max(users, credentials))])
+        owners = accounts[:users]
+        MarketplaceCredential.objects.bulk_create([
+            MarketplaceCredential(user=account, marketplace='AMAZON_AE', client_id=f'bench_{account.pk}', client_secret='s', access_token_hash=hash_token(f'token-{account.pk}'))
+            for account in accounts[:credentials]
+        ], batch_size=10_000)
+        now = timezone.now()
+        statuses = ['Pending', 'Unshipped', 'Shipped', 'Delivered', 'Cancelled', 'Returned']
+        batch = 10_000
+        for first in range(0, rows, batch):
+            span = range(first, min(first + batch, rows))
+            AmazonProduct.objects.bulk_create([
+                AmazonProduct(user=owners[i % users], asin=f'B{i:09d}', sku=f'SKU-{i}', title='Benchmark', category='General', price=10)
+                for i in span
+            ])
+            AmazonOrder.objects.bulk_create([
+                AmazonOrder(user=owners[i % users], amazon_order_id=f'BENCH-{i:09d}', purchase_date=now - timedelta(minutes=i),
+                            order_status=statuses[i % len(statuses)], order_total_amount=10)
+                for i in span
+            ])
+            AmazonInventory.objects.bulk_create([
+                AmazonInventory(user=owners[i % users], asin=f'B{i:09d}', sku=f'SKU-{i}', product_name='Benchmark')
+                for i in span
+            ])
+            NoonProduct.objects.bulk_create([
+                NoonProduct(user=owners[i % users], noon_sku=f'N{i:09d}', partner_sku=f'PSKU-{i}', title='Benchmark', price=10)
+                for i in span
+            ])
+            NoonOrder.objects.bulk_create([
+                NoonOrder(user=owners[i % users], order_nr=f'NBENCH-{i:09d}', order_date=now - timedelta(minutes=i), status='placed',
+                          customer_first_name='A', customer_last_name='B', payment_method='card', total_amount=10, address_city='Dubai')
+                for i in span
+            ])
+        # Spread inventory updates over a week so startDateTime is selective
+        AmazonInventory.objects.filter(user__in=owners).update(last_updated_time=now - timedelta(days=7))
+        return owners
+
+    def queries(self, user, per_user):
+        """The queries behind the list endpoints and token authentication, as the views build them"""
+        deep = per_user // 2
+        since = timezone.now() - timedelta(days=1)
+        amazon_orders = AmazonOrder.objects.filter(user=user).values(*ORDER_LIST_FIELDS)
+        middle_order = amazon_orders.order_by(*ORDER_ORDERING)[deep]
+        noon_orders = NoonOrder.objects.filter(user=user)
+        middle_noon = noon_orders.order_by(*NOON_ORDER_ORDERING).values('order_date', 'id')[deep]
+        middle_product = NoonProduct.objects.filter(user=user).order_by(*NOON_PRODUCT_ORDERING).values_list('id', flat=True)[deep]
+        asins = list(AmazonProduct.objects.filter(user=user).values_list('asin', flat=True)[:20])
+        upload_keys = [f'B{i:09d}' for i in range(0, 1000 * 7, 7)]
+        token = hash_token(f'token-{user.pk}')
+
+        return [
+            ('amazon getOrders first page', lambda: amazon_orders.order_by(*ORDER_ORDERING)[:101]),
+            ('amazon getOrders deep NextToken page', lambda: amazon_orders.filter(
+                keyset_filter(AmazonOrder, ORDER_ORDERING, [middle_order['purchase_date'], middle_order['id']])).order_by(*ORDER_ORDERING)[:101]),
+            ('amazon getOrders OrderStatuses=Pending', lambda: amazon_orders.filter(order_status__in=['Pending']).order_by(*ORDER_ORDERING)[:101]),
+            ('amazon catalog identifiers (asin IN)', lambda: AmazonProduct.objects.filter(user=user, asin__in=asins).only('id', 'asin', 'sku')),
+            ('amazon product upload key lookup', lambda: AmazonProduct.objects.filter(asin__in=upload_keys).values_list('asin', 'pk', 'row_hash')),
+            ('amazon inventory startDateTime feed', lambda: AmazonInventory.objects.filter(
+                user=user, last_updated_time__gte=since).order_by(*INVENTORY_ORDERING)[:51]),
+            ('noon orders deep cursor page', lambda: noon_orders.filter(
+                keyset_filter(NoonOrder, NOON_ORDER_ORDERING, [middle_noon['order_date'], middle_noon['id']])).order_by(*NOON_ORDER_ORDERING)[:51]),
+            ('noon products deep cursor page', lambda: NoonProduct.objects.filter(
+                user=user).filter(keyset_filter(NoonProduct, NOON_PRODUCT_ORDERING, [middle_product])).order_by(*NOON_PRODUCT_ORDERING)[:51]),
+            ('bearer token authentication', lambda: MarketplaceCredential.objects.select_related('user').filter(access_token_hash=token, is_active=True)),
+        ]
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                for model in INDEXED_MODELS:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+            elif connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+    def median_ms(self, fn, repeat):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(times)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+import pandas as pd
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.data_upload.ingest import upload_noon_orders
+from apps.data_upload.readers import detect_format, open_reader
+
+class Command(BaseCommand):
+    help = 'Compares parse and ingest time of the same order sheet across upload formats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Rows in the generated order sheet')
+
+    def handle(self, *args, **options):
+        # Uploads claim rows by key from any other owner, so this never runs
+        # against the configured database: it gets a throwaway test database.
+        self.stdout.write("🧪 Creating a temporary test database...")
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def benchmark(self, options):
+        rows = options['rows']
+        df = self.orders_df(rows)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {
+                'xlsx': os.path.join(tmp, 'orders.xlsx'),
+                'csv': os.path.join(tmp, 'orders.csv'),
+                'ndjson': os.path.join(tmp, 'orders.ndjson'),
+                'parquet': os.path.join(tmp, 'orders.parquet'),
+            }
+            self.stdout.write(f"⚙️  Writing {rows:,} rows in every format...")
+            df.to_excel(paths['xlsx'], index=False)
+            df.to_csv(paths['csv'], index=False)
+            df.to_json(paths['ndjson'], orient='records', lines=True)
+            try:
+                df.to_parquet(paths['parquet'], index=False)
+            except ImportError:
+                del paths['parquet']
+                self.stdout.write(self.style.WARNING("pyarrow not installed, skipping parquet"))
+
+            self.stdout.write(f"{'FORMAT':<8} | {'SIZE MB':>8} | {'PARSE S':>8} | {'INGEST S':>8} | {'ROWS/SEC':>10}")
+            self.stdout.write("=" * 56)
+            for name, path in paths.items():
+                with open(path, 'rb') as f:
+                    file_format = detect_format(f)
+                    start = time.perf_counter()
+                    batches = list(open_reader(f, file_format))
+                    parsed = time.perf_counter() - start
+
+                # Rolled back so every format ingests into the same empty tables
+                with transaction.atomic():
+                    user = User.objects.create(username=f'benchmark_{name}')
+                    start = time.perf_counter()
+                    for batch in batches:
+                        upload_noon_orders(batch, user)
+                    ingested = time.perf_counter() - start
+                    transaction.set_rollback(True)
+
+                size = os.path.getsize(path) / 1024 / 1024
+                total = parsed + ingested
+                self.stdout.write(
+                    f"{file_format:<8} | {size:>8.1f} | {parsed:>8.2f} | {ingested:>8.2f} | {rows / total:>10,.0f}"
+                )
+
+    def orders_df(self, rows):
+        return pd.DataFrame({
+            'order_nr': [f'NB-{i // 3:08d}' for i in range(rows)],
+            'order_date': [f'2024-08-{i % 28 + 1:02d} 10:00:00' for i in range(rows)],
+            'status': 'confirmed',
+            'customer_first_name': 'Bench',
+            'customer_last_name': 'Mark',
+            'customer_email': 'bench@example.ae',
+            'total_amount': [round(20 + i % 300 * 0.25, 2) for i in range(rows)],
+            'address_city': 'Dubai',
+            'payment_method': 'COD',
+            'order_item_id': [f'NBI-{i:09d}' for i in range(rows)],
+            'item_noon_sku': [f'N{i % 5000:09d}' for i in range(rows)],
+            'item_partner_sku': [f'PSKU-{i % 5000}' for i in range(rows)],
+            'item_name': 'Benchmark item',
+            'quantity': [i % 3 + 1 for i in range(rows)],
+            'unit_price': 10.0,
+            'total_price': [(i % 3 + 1) * 10.0 for i in range(rows)],
+        })
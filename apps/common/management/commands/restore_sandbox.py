@@ -20,15 +20,13 @@ class Command(BaseCommand):
         
         if "amazon_ae_amazonorder" in all_tables:
             self.stdout.write("🧹 Cleaning existing data...")
-            from apps.amazon_ae.models import AmazonOrder, AmazonProduct
-            from apps.noon_ae.models import NoonOrder, NoonProduct
+            from apps.data_upload.wipe import wipe_marketplace_data
             from django.contrib.auth.models import User
             
-            # Clear data to ensure the snapshot loads into a clean state
-            AmazonOrder.objects.all().delete()
-            AmazonProduct.objects.all().delete()
-            NoonOrder.objects.all().delete()
-            NoonProduct.objects.all().delete()
+            # Clear data to ensure the snapshot loads into a clean state.
+            # Marketplace tables go first with raw chunked DELETEs (TRUNCATE
+            # on Postgres) so the user cascade below has nothing big left.
+            wipe_marketplace_data()
             User.objects.all().delete()
 
         # 3. Path to the snapshot
@@ -37,8 +35,10 @@ class Command(BaseCommand):
         if os.path.exists(snapshot_path):
             self.stdout.write(f"📥 Loading snapshot from {snapshot_path}...")
             try:
-                # loaddata will now restore Users, Tokens, Orders, and Products exactly
-                call_command('loaddata', snapshot_path)
+                # loaddata will now restore Users, Credentials, Orders, and Products exactly.
+                # Snapshots taken before tokens were hashed carry a plaintext
+                # access_token, which is skipped; clients request a new token.
+                call_command('loaddata', snapshot_path, ignorenonexistent=True)
                 self.stdout.write(self.style.SUCCESS("✅ SUCCESS: Render is now an exact clone of your local DB!"))
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"❌ Error loading data: {e}"))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.amazon_ae.models import AmazonOrder, AmazonOrderItem
+from apps.noon_ae.models import NoonOrder, NoonOrderItem
+from apps.data_upload.totals import AMAZON_ORDER_TOTALS, NOON_ORDER_TOTALS, refresh_order_totals, stale_orders
+from apps.data_upload.versions import bump_data_version
+
+class Command(BaseCommand):
+    help = 'Checks that order totals and item counts match their items (one aggregate query per marketplace)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Recompute the totals of the orders that are off')
+
+    def handle(self, *args, **options):
+        failed = False
+        for name, marketplace, order_model, item_model, totals in [
+            ('Amazon', 'amazon', AmazonOrder, AmazonOrderItem, AMAZON_ORDER_TOTALS),
+            ('Noon', 'noon', NoonOrder, NoonOrderItem, NOON_ORDER_TOTALS),
+        ]:
+            stale = stale_orders(order_model, item_model, totals)
+            if not stale:
+                self.stdout.write(self.style.SUCCESS(f"✅ {name}: every order matches its items"))
+                continue
+
+            sample = ', '.join(str(pk) for pk in stale[:10])
+            self.stdout.write(self.style.WARNING(f"⚠️  {name}: {len(stale)} orders out of sync (pk {sample}{', ...' if len(stale) > 10 else ''})"))
+            if options['fix']:
+                with transaction.atomic():
+                    refresh_order_totals(order_model, item_model, stale, totals)
+                    bump_data_version(None, marketplace)
+                self.stdout.write(self.style.SUCCESS(f"🔧 {name}: recomputed {len(stale)} orders"))
+            else:
+                failed = True
+
+        if failed:
+            raise SystemExit(1)
@@ -1 +1,116 @@
-# Common models if needed
\ No newline at end of file
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.data_upload.versions import bump_data_versions
+
+class DataVersionModel(models.Model):
+    """
+    Bumps the owner's data version on every ORM save() and delete() (admin,
+    stock updates, fix scripts), so no cached page, count or ETag outlives
+    an edit. Bulk writes bypass these and bump the version themselves.
+    """
+    # Marketplace whose data version a write bumps
+    data_version_marketplace = None
+
+    class Meta:
+        abstract = True
+
+    def data_version_owners(self):
+        """Pks of the users whose data this row is part of"""
+        return [self.user_id]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            bump_data_versions(self.data_version_owners(), self.data_version_marketplace)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            owners = self.data_version_owners()
+            result = super().delete(*args, **kwargs)
+            bump_data_versions(owners, self.data_version_marketplace)
+        return result
+
+class RowHashModel(DataVersionModel):
+    """
+    Adds the content hash the bulk upload path stores with every row it
+    writes, so re-uploading an identical row can be skipped. Any ordinary
+    save() (admin, stock updates, fix scripts) clears it, so rows edited
+    outside an upload are always rewritten by the next one.
+    """
+    row_hash = models.CharField(max_length=16, blank=True, default='', editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.row_hash = ''
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'row_hash'}
+        super().save(*args, **kwargs)
+
+class OrderItemTotalsModel(DataVersionModel):
+    """
+    Base for order items whose order carries totals derived from its items.
+    Subclasses return their share of each order field from order_totals();
+    save() and delete() apply the difference to the order with F()
+    increments. Bulk writes bypass these and recompute the totals instead.
+    """
+
+    class Meta:
+        abstract = True
+
+    def order_totals(self):
+        raise NotImplementedError
+
+    def data_version_owners(self):
+        return [self.order.user_id]
+
+    def apply_order_totals(self, deltas, replace=None):
+        """
+        Add ``deltas`` (order pk -> field -> amount) to the orders' fields.
+        The order in ``replace`` has its fields set to the amounts instead.
+        """
+        order_model = self._meta.get_field('order').related_model
+        for order_id, fields in deltas.items():
+            if order_id is None:
+                continue
+            if order_id == replace:
+                changes = fields
+            else:
+                changes = {
+                    field: Coalesce(F(field), Value(0), output_field=order_model._meta.get_field(field)) + delta
+                    for field, delta in fields.items() if delta
+                }
+            if changes:
+                # update() skips auto_now, and LastUpdatedAfter polls rely on it
+                order_model.objects.filter(pk=order_id).update(updated_at=timezone.now(), **changes)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            old = type(self).objects.filter(pk=self.pk).first() if self.pk else None
+            super().save(*args, **kwargs)
+
+            deltas = {self.order_id: dict(self.order_totals())}
+            if old is not None:
+                shares = deltas.setdefault(old.order_id, {})
+                for field, value in old.order_totals().items():
+                    shares[field] = shares.get(field, 0) - value
+
+            # An order's first item replaces whatever totals it was imported with
+            replace = None
+            if old is None or old.order_id != self.order_id:
+                if not type(self).objects.filter(order_id=self.order_id).exclude(pk=self.pk).exists():
+                    replace = self.order_id
+            self.apply_order_totals(deltas, replace)
+            if old is not None and old.order_id != self.order_id:
+                bump_data_versions(old.data_version_owners(), self.data_version_marketplace)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            old = type(self).objects.filter(pk=self.pk).first()
+            result = super().delete(*args, **kwargs)
+            if old is not None:
+                self.apply_order_totals({old.order_id: {field: -value for field, value in old.order_totals().items()}})
+        return result
@@ -0,0 +1,35 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson's own datetimes match DRF's isoformat-with-Z output (the only
+# difference is sub-minute UTC offsets, which only pre-1900 zone data has);
+# Decimals, lazy strings and the rest fall back to DRF's encoder.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on top of orjson. For the mock's payloads (strings,
+    integers, Decimals rendered as strings, datetimes) the JSON is
+    equivalent to DRF's compact renderer, but not byte for byte: floats
+    may be written differently (e.g. exponents), and NaN and Infinity
+    become null where the stdlib renderer raises. Indented output (the
+    browsable API, ``indent=`` requests) and anything orjson rejects, such
+    as integers beyond 64 bits, go through the stdlib renderer instead.
+    """
+    default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-JavaScript escaping as JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -1 +1,107 @@
-# Common views if needed
\ No newline at end of file
+import hashlib
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+from apps.data_upload.versions import get_data_version
+
+class EarlyResponse(Exception):
+    """Raised from initial() to answer a GET before the handler runs"""
+    def __init__(self, response):
+        self.response = response
+
+def count_cache_event(marketplace, event):
+    """Bump the response cache ``event`` ('hits' or 'misses') counter"""
+    key = f'response_cache:{marketplace}:{event}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+def response_cache_stats():
+    """Hit and miss counters per marketplace (per process with the local-memory cache)"""
+    stats = {}
+    for marketplace in ('amazon', 'noon'):
+        counters = cache.get_many([f'response_cache:{marketplace}:hits', f'response_cache:{marketplace}:misses'])
+        hits = counters.get(f'response_cache:{marketplace}:hits', 0)
+        misses = counters.get(f'response_cache:{marketplace}:misses', 0)
+        stats[marketplace] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return stats
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified for every GET of a viewset, derived from the
+    caller's data version in ``data_version_marketplace``. A matching
+    If-None-Match (or, when none is sent, If-Modified-Since) is answered
+    with 304 right after authentication, before any query or
+    serialization runs.
+
+    Rendered JSON bodies are also cached under the same version, so
+    identical requests from clients sharing credentials skip the query
+    and serializer too; any write bumps the version and retires them.
+    """
+    data_version_marketplace = None
+
+    def get_validators(self, request):
+        version = get_data_version(request.user, self.data_version_marketplace)
+        # Each URL, token marketplace and accepted media type (indent
+        # included) has its own body; parameter order does not matter
+        params = urlencode(sorted((k, v) for k, values in request.query_params.lists() for v in values))
+        # updated_at tells apart counters that restarted, e.g. after a restore
+        key = f'{request.user.pk}|{request.auth.marketplace}|{version.version}|{version.updated_at.isoformat()}|{request.accepted_media_type}|{request.path}?{params}'
+        digest = hashlib.md5(key.encode()).hexdigest()
+        return f'"{digest}"', int(version.updated_at.timestamp()), f'response:{digest}'
+
+    def response_cacheable(self, request):
+        return settings.RESPONSE_CACHE_TIMEOUT > 0 and request.accepted_renderer.format == 'json'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        self.validators = etag, last_modified, cache_key = self.get_validators(request)
+        # Last-Modified only has second resolution, so a write within the
+        # same second keeps it; as RFC 9110 requires, If-Modified-Since is
+        # ignored whenever If-None-Match is sent and the ETag alone decides.
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            last_modified = None
+        not_modified = get_conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            raise EarlyResponse(not_modified)
+
+        if self.response_cacheable(request):
+            cached = cache.get(cache_key)
+            count_cache_event(self.data_version_marketplace, 'hits' if cached else 'misses')
+            if cached:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response.headers['X-Cache'] = 'HIT'
+                raise EarlyResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if not validators or response.status_code not in (200, 304):
+            return response
+
+        etag, last_modified, cache_key = validators
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(last_modified)
+        if response.status_code == 200 and isinstance(response, Response) and self.response_cacheable(request):
+            response.render()
+            cache.set(cache_key, (response.content, response.headers['Content-Type']), settings.RESPONSE_CACHE_TIMEOUT)
+            response.headers['X-Cache'] = 'MISS'
+        return response
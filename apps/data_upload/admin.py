@@ -1 +1,13 @@
-# No models to register
\ No newline at end of file
+from django.contrib import admin
+from .models import UploadJob, UploadCheckpoint
+
+@admin.register(UploadJob)
+class UploadJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'marketplace', 'data_type', 'state', 'rows_done', 'rows_total', 'created_at']
+    list_filter = ['marketplace', 'data_type', 'state']
+    search_fields = ['user__username']
+
+@admin.register(UploadCheckpoint)
+class UploadCheckpointAdmin(admin.ModelAdmin):
+    list_display = ['file_hash', 'user', 'marketplace', 'data_type', 'rows_committed', 'chunks_committed', 'completed']
+    list_filter = ['marketplace', 'data_type', 'completed']
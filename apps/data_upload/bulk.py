@@ -0,0 +1,78 @@
+BULK_CHUNK_SIZE = 1000
+
+def chunked(seq, size):
+    """Yield successive slices of ``seq`` with at most ``size`` elements"""
+    for start in range(0, len(seq), size):
+        yield seq[start:start + size]
+
+def load_existing_keys(model, key_field, keys, batch_size=BULK_CHUNK_SIZE, scope=None, with_hash=False):
+    """
+    Map key -> pk for every key that already exists, one query per chunk.
+    With ``with_hash`` the values are (pk, row_hash) pairs instead.
+    """
+    existing = {}
+    for chunk in chunked(keys, batch_size):
+        qs = model.objects.filter(**(scope or {}), **{f'{key_field}__in': chunk})
+        if with_hash:
+            existing.update((key, (pk, row_hash)) for key, pk, row_hash in qs.values_list(key_field, 'pk', 'row_hash'))
+        else:
+            existing.update(qs.values_list(key_field, 'pk'))
+    return existing
+
+def bulk_upsert(model, key_field, rows, update_fields, batch_size=BULK_CHUNK_SIZE, scope=None):
+    """
+    Bulk equivalent of calling ``update_or_create(**scope, key_field=key, defaults=values)``
+    for every ``(key, values)`` pair in ``rows``.
+
+    Later rows win when a key repeats, and the returned counts match what the
+    per-row loop would have reported (a repeated key counts as an update).
+    When the values carry a ``row_hash``, rows whose stored hash is identical
+    are left untouched and reported as unchanged.
+    """
+    scope = scope or {}
+    latest = {}
+    total = 0
+    for key, values in rows:
+        latest[key] = values
+        total += 1
+
+    keys = list(latest)
+    hashed = 'row_hash' in update_fields
+    existing = load_existing_keys(model, key_field, keys, batch_size, scope, with_hash=hashed)
+    if hashed:
+        unchanged = {key for key, (pk, row_hash) in existing.items() if row_hash == latest[key]['row_hash']}
+        existing = {key: pk for key, (pk, row_hash) in existing.items()}
+        keys = [key for key in keys if key not in unchanged]
+    else:
+        unchanged = set()
+
+    fields = list(update_fields)
+    fields += [f.name for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+
+    conflict = {*scope, key_field}
+    unique_sets = [{f.name} for f in model._meta.concrete_fields if f.unique]
+    unique_sets += [set(together) for together in model._meta.unique_together]
+    if conflict in unique_sets:
+        # A real unique constraint lets the database resolve creates and
+        # updates itself with INSERT ... ON CONFLICT DO UPDATE.
+        unique_fields = [*scope, key_field]
+        make = lambda key: model(**scope, **{key_field: key}, **latest[key])
+    else:
+        # Without one, rows we already know about carry their pk and
+        # conflict on it instead, which avoids bulk_update's CASE chains.
+        unique_fields = [model._meta.pk.name]
+        make = lambda key: model(pk=existing.get(key), **scope, **{key_field: key}, **latest[key])
+
+    for chunk in chunked(keys, batch_size):
+        model.objects.bulk_create(
+            [make(key) for key in chunk],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=fields,
+        )
+
+    created = len(latest) - len(existing)
+    result = {'created': created, 'updated': total - created - len(unchanged)}
+    if hashed:
+        result['unchanged'] = len(unchanged)
+    return result
@@ -0,0 +1,116 @@
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import current_process
+import pandas as pd
+from openpyxl import load_workbook
+from .readers import XlsxReader, detect_format, open_reader
+
+# Parts a bundle may contain, in the order they are written: products
+# first so inventory and order items can be linked to them, orders last.
+BUNDLE_PARTS = [
+    ('amazon', 'products'),
+    ('noon', 'products'),
+    ('amazon', 'inventory'),
+    ('noon', 'inventory'),
+    ('amazon', 'orders'),
+    ('noon', 'orders'),
+]
+
+def detect_bundle_format(file):
+    """'xlsx' for a workbook, 'zip' for an archive of per-part files, None for anything else"""
+    if not zipfile.is_zipfile(file):
+        file.seek(0)
+        return None
+    file.seek(0)
+    with zipfile.ZipFile(file) as archive:
+        names = archive.namelist()
+    file.seek(0)
+    if '[Content_Types].xml' in names and any(name.startswith('xl/') for name in names):
+        return 'xlsx'
+    return 'zip'
+
+def part_of(name):
+    """
+    The (marketplace, data_type) a sheet or archive member is named after,
+    e.g. "Amazon Products", "noon_orders.csv" or "amazon_ae_inventory.xlsx".
+    """
+    words = set(re.split(r'[^a-z]+', name.lower()))
+    for marketplace, data_type in BUNDLE_PARTS:
+        if marketplace in words and data_type in words:
+            return marketplace, data_type
+    return None
+
+def list_parts(path, bundle_format):
+    """
+    Map (marketplace, data_type) -> sheet or member name. Returns the
+    names that matched no part as well so they can be reported back.
+    """
+    if bundle_format == 'xlsx':
+        workbook = load_workbook(path, read_only=True)
+        names = workbook.sheetnames
+        workbook.close()
+    else:
+        with zipfile.ZipFile(path) as archive:
+            names = [
+                name for name in archive.namelist()
+                if not name.endswith('/') and not name.startswith('__MACOSX/')
+                and not os.path.basename(name).startswith('.')
+            ]
+
+    parts = {}
+    skipped = []
+    for name in names:
+        stem = name if bundle_format == 'xlsx' else os.path.splitext(os.path.basename(name))[0]
+        part = part_of(stem)
+        if part is None:
+            skipped.append(name)
+        elif part in parts:
+            raise ValueError(f'Both "{parts[part]}" and "{name}" look like {part[0]} {part[1]}')
+        else:
+            parts[part] = name
+    return parts, skipped
+
+def read_part(path, bundle_format, name):
+    """Parse one sheet or archive member into a single frame, the way the upload readers do"""
+    if bundle_format == 'xlsx':
+        with open(path, 'rb') as f:
+            reader = XlsxReader(f, sheet_name=name)
+            try:
+                frames = list(reader)
+            finally:
+                reader.close()
+    else:
+        with zipfile.ZipFile(path) as archive:
+            member = io.BytesIO(archive.read(name))
+        member.name = name
+        reader = open_reader(member, detect_format(member))
+        try:
+            frames = list(reader)
+        finally:
+            reader.close()
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def read_parts(path, bundle_format, parts, workers):
+    """
+    Yield (marketplace, data_type, frame) in write order. With more than
+    one worker every part is parsed up front in a process pool, so writing
+    the first part overlaps with parsing the rest and the total parse time
+    is roughly that of the slowest sheet.
+    """
+    order = [part for part in BUNDLE_PARTS if part in parts]
+    # Daemonic processes (e.g. multiprocessing-based workers) cannot fork
+    if workers <= 1 or len(order) <= 1 or current_process().daemon:
+        for part in order:
+            yield (*part, read_part(path, bundle_format, parts[part]))
+        return
+
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(order)))
+    try:
+        futures = [pool.submit(read_part, path, bundle_format, parts[part]) for part in order]
+        for part, future in zip(order, futures):
+            yield (*part, future.result())
+    finally:
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,234 @@
+from apps.amazon_ae.models import AmazonProduct, AmazonOrder, AmazonOrderItem, AmazonInventory
+from apps.noon_ae.models import NoonProduct, NoonOrder, NoonOrderItem, NoonInventory
+from .bulk import BULK_CHUNK_SIZE, bulk_upsert, chunked, load_existing_keys
+from .normalize import normalize, records, row_hashes
+from .totals import AMAZON_ORDER_TOTALS, NOON_ORDER_TOTALS, refresh_order_totals
+from .versions import bump_data_versions
+
+# Each spec maps model field -> (sheet column, kind, default). The key
+# column comes first; rows where it normalizes to '' are skipped.
+AMAZON_PRODUCT_COLUMNS = {
+    'asin': ('asin', 'str', ''),
+    'sku': ('sku', 'str', 'UNKNOWN'),
+    'title': ('title', 'str', 'Untitled'),
+    'description': ('description', 'str', ''),
+    'brand': ('brand', 'str', ''),
+    'category': ('category', 'str', 'General'),
+    'price': ('price', 'num', 0),
+    'quantity': ('quantity', 'int', 0),
+    'image_url': ('image_url', 'str', ''),
+    'status': ('status', 'str', 'ACTIVE'),
+}
+
+AMAZON_PRODUCT_FIELDS = ['user', *list(AMAZON_PRODUCT_COLUMNS)[1:], 'row_hash']
+
+AMAZON_ORDER_COLUMNS = {
+    'amazon_order_id': ('amazon_order_id', 'str', ''),
+    'purchase_date': ('purchase_date', 'date', None),
+    'order_status': ('order_status', 'str', 'Pending'),
+    'order_total_amount': ('order_total_amount', 'num', 0),
+    'buyer_email': ('buyer_email', 'str', ''),
+    'buyer_name': ('buyer_name', 'str', ''),
+}
+
+AMAZON_ORDER_FIELDS = ['user', *list(AMAZON_ORDER_COLUMNS)[1:]]
+
+AMAZON_ORDER_ITEM_COLUMNS = {
+    'order_item_id': ('order_item_id', 'str', ''),
+    'asin': ('item_asin', 'str', ''),
+    'sku': ('item_sku', 'str', ''),
+    'title': ('item_title', 'str', 'Product'),
+    'quantity_ordered': ('quantity_ordered', 'int', 1),
+    'item_price_amount': ('item_price', 'num', 0),
+}
+
+# Writing an item always clears its product link, which marks it for repair
+AMAZON_ORDER_ITEM_FIELDS = ['order', 'product', *list(AMAZON_ORDER_ITEM_COLUMNS)[1:]]
+
+AMAZON_INVENTORY_COLUMNS = {
+    'sku': ('sku', 'str', ''),
+    'asin': ('asin', 'str', ''),
+    'product_name': ('product_name', 'str', ''),
+    'available_quantity': ('available_quantity', 'int', 0),
+    'pending_quantity': ('pending_quantity', 'int', 0),
+    'reserved_quantity': ('reserved_quantity', 'int', 0),
+    'total_quantity': ('total_quantity', 'int', 0),
+}
+
+AMAZON_INVENTORY_FIELDS = [*list(AMAZON_INVENTORY_COLUMNS)[1:], 'row_hash']
+
+NOON_PRODUCT_COLUMNS = {
+    'noon_sku': ('noon_sku', 'str', ''),
+    'partner_sku': ('partner_sku', 'str', ''),
+    'title': ('title', 'str', ''),
+    'title_ar': ('title_ar', 'str', ''),
+    'brand': ('brand', 'str', ''),
+    'category_code': ('category_code', 'str', ''),
+    'product_type': ('product_type', 'str', ''),
+    'price': ('price', 'num', 0),
+    'sale_price': ('sale_price', 'optional_num', 0),
+    'stock_quantity': ('stock_quantity', 'int', 0),
+    'status': ('status', 'str', 'active'),
+}
+
+NOON_PRODUCT_FIELDS = ['user', *list(NOON_PRODUCT_COLUMNS)[1:], 'row_hash']
+
+NOON_ORDER_COLUMNS = {
+    'order_nr': ('order_nr', 'str', ''),
+    'order_date': ('order_date', 'date', None),
+    'status': ('status', 'str', 'placed'),
+    'customer_first_name': ('customer_first_name', 'str', ''),
+    'customer_last_name': ('customer_last_name', 'str', ''),
+    'customer_email': ('customer_email', 'str', ''),
+    'total_amount': ('total_amount', 'num', 0),
+    'address_city': ('address_city', 'str', ''),
+    'payment_method': ('payment_method', 'str', 'COD'),
+}
+
+NOON_ORDER_FIELDS = ['user', *list(NOON_ORDER_COLUMNS)[1:]]
+
+NOON_ORDER_ITEM_COLUMNS = {
+    'order_item_id': ('order_item_id', 'str', ''),
+    'noon_sku': ('item_noon_sku', 'str', ''),
+    'partner_sku': ('item_partner_sku', 'str', ''),
+    'name': ('item_name', 'str', ''),
+    'quantity': ('quantity', 'int', 1),
+    'unit_price': ('unit_price', 'num', 0),
+    'total_price': ('total_price', 'num', 0),
+    'status': ('item_status', 'str', 'confirmed'),
+}
+
+NOON_ORDER_ITEM_FIELDS = ['order', 'product', *list(NOON_ORDER_ITEM_COLUMNS)[1:]]
+
+NOON_INVENTORY_COLUMNS = {
+    'partner_sku': ('partner_sku', 'str', ''),
+    'noon_sku': ('noon_sku', 'str', ''),
+    'barcode': ('barcode', 'str', ''),
+    'quantity': ('quantity', 'int', 0),
+    'reserved_quantity': ('reserved_quantity', 'int', 0),
+    'warehouse_code': ('warehouse_code', 'str', ''),
+}
+
+NOON_INVENTORY_FIELDS = [*list(NOON_INVENTORY_COLUMNS)[1:], 'row_hash']
+
+def keyed_rows(df, columns, user):
+    """
+    Normalize ``df`` and yield (key, field dict) for rows with a non-empty
+    key. Every dict carries the row's content hash, which covers the owning
+    user as well so a row moving between accounts is never "unchanged".
+    """
+    df = normalize(df, columns)
+    key, *fields = df.columns
+    df = df[df[key] != '']
+    hashes = row_hashes(df.assign(user_id=user.pk))
+    for (key_value, *values), row_hash in zip(records(df), hashes):
+        yield key_value, {**dict(zip(fields, values)), 'row_hash': row_hash}
+
+def retire_other_owners(model, key_field, keys, user, marketplace):
+    """
+    Products and orders are keyed globally, so an upload can take rows over
+    from another user; bump those users' data versions so nothing they have
+    cached still lists the rows.
+    """
+    owners = set()
+    for chunk in chunked(keys, BULK_CHUNK_SIZE):
+        owners.update(model.objects.filter(**{f'{key_field}__in': chunk}).exclude(user=user).values_list('user_id', flat=True))
+    bump_data_versions(owners, marketplace)
+
+def upload_orders(df, user, marketplace, order_model, order_columns, order_fields, item_model, item_columns, item_fields, totals):
+    """
+    Each row carries an order and optionally one of its items. Rows are
+    grouped by order id so every order and item is written once, in bulk,
+    after which the totals of every touched order that has items are
+    derived from them again (bulk writes bypass the items' save()). An
+    order whose last item moved to another one drops to zero.
+    """
+    orders = normalize(df, order_columns)
+    items = normalize(df, item_columns)
+    order_key, *order_names = orders.columns
+    item_key, *item_names = items.columns
+    keep = (orders[order_key] != '').to_numpy()
+    orders, items = orders[keep], items[keep]
+
+    order_rows = [
+        (key, {'user': user, **dict(zip(order_names, values))})
+        for key, *values in records(orders)
+    ]
+    retire_other_owners(order_model, order_key, list(dict.fromkeys(key for key, _ in order_rows)), user, marketplace)
+    order_result = bulk_upsert(order_model, order_key, order_rows, order_fields)
+    order_pks = load_existing_keys(order_model, order_key, list(dict.fromkeys(orders[order_key].tolist())))
+
+    item_rows = [
+        (key, {'order_id': order_pks[order], **dict(zip(item_names, values))})
+        for order, (key, *values) in zip(orders[order_key].tolist(), records(items))
+        if key
+    ]
+    # Items moving to another order leave a total behind that needs fixing too
+    item_keys = list(dict.fromkeys(key for key, _ in item_rows))
+    uploaded = set(order_pks.values())
+    previous = set()
+    for chunk in chunked(item_keys, BULK_CHUNK_SIZE):
+        previous.update(item_model.objects.filter(**{f'{item_key}__in': chunk}).values_list('order_id', flat=True))
+
+    # Orders other users own can lose items to this upload as well
+    retire_other_owners(order_model, 'pk', list(previous - uploaded), user, marketplace)
+    item_result = bulk_upsert(item_model, item_key, item_rows, item_fields)
+    refresh_order_totals(order_model, item_model, uploaded | previous, totals, emptied_pks=previous - uploaded)
+
+    return {
+        **{f'orders_{name}': count for name, count in order_result.items()},
+        **{f'items_{name}': count for name, count in item_result.items()},
+    }
+
+def upload_amazon_products(df, user):
+    rows = [
+        (asin, {'user': user, **values})
+        for asin, values in keyed_rows(df, AMAZON_PRODUCT_COLUMNS, user)
+    ]
+    retire_other_owners(AmazonProduct, 'asin', list(dict.fromkeys(asin for asin, _ in rows)), user, 'amazon')
+    return bulk_upsert(AmazonProduct, 'asin', rows, AMAZON_PRODUCT_FIELDS)
+
+def upload_amazon_orders(df, user):
+    return upload_orders(
+        df, user, 'amazon',
+        AmazonOrder, AMAZON_ORDER_COLUMNS, AMAZON_ORDER_FIELDS,
+        AmazonOrderItem, AMAZON_ORDER_ITEM_COLUMNS, AMAZON_ORDER_ITEM_FIELDS,
+        AMAZON_ORDER_TOTALS,
+    )
+
+def upload_amazon_inventory(df, user):
+    rows = keyed_rows(df, AMAZON_INVENTORY_COLUMNS, user)
+    return bulk_upsert(AmazonInventory, 'sku', rows, AMAZON_INVENTORY_FIELDS, scope={'user': user})
+
+def upload_noon_products(df, user):
+    rows = [
+        (noon_sku, {'user': user, **values})
+        for noon_sku, values in keyed_rows(df, NOON_PRODUCT_COLUMNS, user)
+    ]
+    retire_other_owners(NoonProduct, 'noon_sku', list(dict.fromkeys(noon_sku for noon_sku, _ in rows)), user, 'noon')
+    return bulk_upsert(NoonProduct, 'noon_sku', rows, NOON_PRODUCT_FIELDS)
+
+def upload_noon_orders(df, user):
+    return upload_orders(
+        df, user, 'noon',
+        NoonOrder, NOON_ORDER_COLUMNS, NOON_ORDER_FIELDS,
+        NoonOrderItem, NOON_ORDER_ITEM_COLUMNS, NOON_ORDER_ITEM_FIELDS,
+        NOON_ORDER_TOTALS,
+    )
+
+def upload_noon_inventory(df, user):
+    rows = keyed_rows(df, NOON_INVENTORY_COLUMNS, user)
+    return bulk_upsert(NoonInventory, 'partner_sku', rows, NOON_INVENTORY_FIELDS, scope={'user': user})
+
+UPLOADERS = {
+    'amazon': {
+        'products': upload_amazon_products,
+        'orders': upload_amazon_orders,
+        'inventory': upload_amazon_inventory,
+    },
+    'noon': {
+        'products': upload_noon_products,
+        'orders': upload_noon_orders,
+        'inventory': upload_noon_inventory,
+    },
+}
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('marketplace', models.CharField(choices=[('amazon', 'Amazon AE'), ('noon', 'Noon AE')], max_length=20)),
+                ('data_type', models.CharField(choices=[('products', 'Products'), ('orders', 'Orders'), ('inventory', 'Inventory')], max_length=20)),
+                ('file', models.FileField(upload_to='uploads/%Y/%m/%d/')),
+                ('state', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILURE', 'Failure')], default='PENDING', max_length=20)),
+                ('rows_total', models.IntegerField(default=0)),
+                ('rows_done', models.IntegerField(default=0)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
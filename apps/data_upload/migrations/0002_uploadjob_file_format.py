@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_upload', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='file_format',
+            field=models.CharField(choices=[('xlsx', 'Excel (XLSX)'), ('xls', 'Excel 97-2003 (XLS)'), ('csv', 'CSV'), ('ndjson', 'NDJSON'), ('parquet', 'Parquet')], default='xlsx', max_length=10),
+        ),
+    ]
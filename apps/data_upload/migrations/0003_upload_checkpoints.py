@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('data_upload', '0002_uploadjob_file_format'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='chunk_size',
+            field=models.IntegerField(default=5000),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='chunks_committed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='file_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='resumed_from_row',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='UploadCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marketplace', models.CharField(choices=[('amazon', 'Amazon AE'), ('noon', 'Noon AE')], max_length=20)),
+                ('data_type', models.CharField(choices=[('products', 'Products'), ('orders', 'Orders'), ('inventory', 'Inventory')], max_length=20)),
+                ('file_hash', models.CharField(max_length=64)),
+                ('rows_committed', models.IntegerField(default=0)),
+                ('chunks_committed', models.IntegerField(default=0)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('completed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_checkpoints', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'marketplace', 'data_type', 'file_hash')},
+            },
+        ),
+    ]
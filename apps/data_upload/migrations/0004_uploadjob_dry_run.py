@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_upload', '0003_upload_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='dry_run',
+            field=models.BooleanField(default=False),
+        ),
+    ]
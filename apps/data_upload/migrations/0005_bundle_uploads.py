@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_upload', '0004_uploadjob_dry_run'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uploadcheckpoint',
+            name='data_type',
+            field=models.CharField(choices=[('products', 'Products'), ('orders', 'Orders'), ('inventory', 'Inventory'), ('bundle', 'Bundle')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='uploadcheckpoint',
+            name='marketplace',
+            field=models.CharField(choices=[('amazon', 'Amazon AE'), ('noon', 'Noon AE'), ('all', 'All marketplaces')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='uploadjob',
+            name='data_type',
+            field=models.CharField(choices=[('products', 'Products'), ('orders', 'Orders'), ('inventory', 'Inventory'), ('bundle', 'Bundle')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='uploadjob',
+            name='file_format',
+            field=models.CharField(choices=[('xlsx', 'Excel (XLSX)'), ('xls', 'Excel 97-2003 (XLS)'), ('csv', 'CSV'), ('ndjson', 'NDJSON'), ('parquet', 'Parquet'), ('zip', 'Zip archive')], default='xlsx', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='uploadjob',
+            name='marketplace',
+            field=models.CharField(choices=[('amazon', 'Amazon AE'), ('noon', 'Noon AE'), ('all', 'All marketplaces')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('data_upload', '0005_bundle_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marketplace', models.CharField(choices=[('amazon', 'Amazon AE'), ('noon', 'Noon AE'), ('all', 'All marketplaces')], max_length=20)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_versions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'marketplace')},
+            },
+        ),
+    ]
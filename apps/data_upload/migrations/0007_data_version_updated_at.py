@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:38
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_upload', '0006_data_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataversion',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_upload', '0007_data_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadcheckpoint',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,104 @@
+import uuid
+from django.db import models
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+class UploadJob(models.Model):
+    STATE_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('SUCCESS', 'Success'),
+        ('FAILURE', 'Failure'),
+    ]
+    MARKETPLACE_CHOICES = [
+        ('amazon', 'Amazon AE'),
+        ('noon', 'Noon AE'),
+        ('all', 'All marketplaces'),
+    ]
+    DATA_TYPE_CHOICES = [
+        ('products', 'Products'),
+        ('orders', 'Orders'),
+        ('inventory', 'Inventory'),
+        ('bundle', 'Bundle'),
+    ]
+    FORMAT_CHOICES = [
+        ('xlsx', 'Excel (XLSX)'),
+        ('xls', 'Excel 97-2003 (XLS)'),
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+        ('parquet', 'Parquet'),
+        ('zip', 'Zip archive'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_jobs')
+    marketplace = models.CharField(max_length=20, choices=MARKETPLACE_CHOICES)
+    data_type = models.CharField(max_length=20, choices=DATA_TYPE_CHOICES)
+    file = models.FileField(upload_to='uploads/%Y/%m/%d/')
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='xlsx')
+    file_hash = models.CharField(max_length=64, blank=True, default='')
+    chunk_size = models.IntegerField(default=5000)
+    dry_run = models.BooleanField(default=False)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default='PENDING')
+    rows_total = models.IntegerField(default=0)
+    rows_done = models.IntegerField(default=0)
+    chunks_committed = models.IntegerField(default=0)
+    resumed_from_row = models.IntegerField(default=0)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.marketplace} {self.data_type} - {self.state}"
+
+    @property
+    def rows_per_sec(self):
+        if not self.started_at:
+            return 0.0
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return round(self.rows_done / elapsed, 1) if elapsed > 0 else 0.0
+
+class UploadCheckpoint(models.Model):
+    """
+    Progress of one file (identified by its sha256) for one user and data
+    type. Updated in the same transaction as every committed chunk, so it
+    always points at the first row that still has to be written.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_checkpoints')
+    marketplace = models.CharField(max_length=20, choices=UploadJob.MARKETPLACE_CHOICES)
+    data_type = models.CharField(max_length=20, choices=UploadJob.DATA_TYPE_CHOICES)
+    file_hash = models.CharField(max_length=64)
+    rows_committed = models.IntegerField(default=0)
+    chunks_committed = models.IntegerField(default=0)
+    result = models.JSONField(default=dict, blank=True)
+    completed = models.BooleanField(default=False)
+    # Data version once the file was fully written; an identical re-upload
+    # is only skipped while nothing else has written since
+    data_version = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'marketplace', 'data_type', 'file_hash']
+
+    def __str__(self):
+        return f"{self.file_hash[:12]} - row {self.rows_committed}"
+
+class DataVersion(models.Model):
+    """
+    Write counter for one user's data in one marketplace. Every write path
+    (uploads, ORM edits, wipes, relinking) bumps it, so anything cached
+    under an older version is simply never read again.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='data_versions')
+    marketplace = models.CharField(max_length=20, choices=UploadJob.MARKETPLACE_CHOICES)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['user', 'marketplace']
+
+    def __str__(self):
+        return f"{self.marketplace} v{self.version}"
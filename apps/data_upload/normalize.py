@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def to_str(s, default=''):
+    """Column-wise safe string: missing -> default, everything else str().strip()"""
+    missing = s.isna()
+    out = s.astype(str).str.strip()
+    out[missing] = default
+    return out
+
+def to_num(s, default=0):
+    """Column-wise safe float: missing or unparseable -> default"""
+    return pd.to_numeric(s, errors='coerce').fillna(default).astype(float)
+
+def to_int(s, default=0):
+    """Like to_num but truncated towards zero, as int(float(value)) would"""
+    return np.trunc(to_num(s, default)).astype('int64')
+
+def to_optional_num(s, default=0):
+    """Missing stays None; present but unparseable falls back to default"""
+    out = to_num(s, default).astype(object)
+    out[s.isna()] = None
+    return out
+
+def to_date(s, default=None):
+    """
+    Parse ``DATE_FORMAT`` strings, keep values that already are datetimes and
+    fall back to the current time for anything missing or unparseable.
+    """
+    out = pd.to_datetime(s, format=DATE_FORMAT, errors='coerce').astype(object)
+    out[out.isna()] = default or datetime.now()
+    return out
+
+CONVERTERS = {
+    'str': to_str,
+    'num': to_num,
+    'int': to_int,
+    'optional_num': to_optional_num,
+    'date': to_date,
+}
+
+def normalize(df, columns):
+    """
+    Build a new frame with one normalized column per entry of ``columns``,
+    which maps target field -> (source column, kind, default). Source columns
+    missing from the sheet are treated as entirely empty.
+    """
+    out = {}
+    for field, (source, kind, default) in columns.items():
+        if source in df.columns:
+            s = df[source].reset_index(drop=True)
+        else:
+            s = pd.Series([None] * len(df), dtype=object)
+        out[field] = CONVERTERS[kind](s, default)
+    return pd.DataFrame(out)
+
+def row_hashes(df):
+    """Stable 64-bit content hash of every row, as 16 hex characters"""
+    return [f'{h:016x}' for h in pd.util.hash_pandas_object(df, index=False).tolist()]
+
+def records(df):
+    """Plain tuples of native Python values, one per row"""
+    return zip(*(df[column].tolist() for column in df.columns))
@@ -0,0 +1,222 @@
+import csv
+import hashlib
+import io
+import os
+import pandas as pd
+from openpyxl import load_workbook
+
+READ_BATCH_SIZE = 5000
+
+CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/json': 'ndjson',
+    'application/vnd.apache.parquet': 'parquet',
+    'application/x-parquet': 'parquet',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'xlsx',
+    'application/vnd.ms-excel': 'xls',
+}
+
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.json': 'ndjson',
+    '.parquet': 'parquet',
+    '.xlsx': 'xlsx',
+    '.xls': 'xls',
+}
+
+def detect_format(file):
+    """
+    Work out the upload format from the file's magic bytes, falling back
+    to its content type, extension and finally the first character.
+    """
+    head = file.read(8)
+    file.seek(0)
+
+    # Binary formats carry a signature, which beats whatever the client claimed
+    if head.startswith(b'PK\x03\x04'):
+        return 'xlsx'
+    if head.startswith(b'PAR1'):
+        return 'parquet'
+    if head.startswith(b'\xd0\xcf\x11\xe0'):
+        return 'xls'
+
+    content_type = (getattr(file, 'content_type', '') or '').split(';')[0].strip().lower()
+    if content_type in CONTENT_TYPES:
+        return CONTENT_TYPES[content_type]
+
+    extension = os.path.splitext(getattr(file, 'name', '') or '')[1].lower()
+    if extension in EXTENSIONS:
+        return EXTENSIONS[extension]
+
+    if head.lstrip().startswith(b'{'):
+        return 'ndjson'
+    return 'csv'
+
+def file_sha256(file):
+    """Hash an uploaded file without reading it into memory in one go"""
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+class BatchReader:
+    """
+    Base class for upload readers. Subclasses implement ``batches()`` and
+    yield DataFrames of at most ``batch_size`` rows; iteration maps missing
+    values to None the same way the ingest functions have always expected.
+    ``total_rows`` is the number of data rows, for progress reporting.
+    """
+    total_rows = 0
+
+    def __init__(self, file, batch_size=READ_BATCH_SIZE):
+        self.file = file
+        self.batch_size = batch_size
+
+    def __iter__(self):
+        for df in self.batches():
+            yield df.where(pd.notnull(df), None)
+
+    def batches(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class XlsxReader(BatchReader):
+    """
+    Streams one worksheet (the first unless ``sheet_name`` is given) of an
+    XLSX file using openpyxl's read-only mode, so only one batch is held in
+    memory regardless of sheet length.
+    """
+
+    def __init__(self, file, batch_size=READ_BATCH_SIZE, sheet_name=None):
+        super().__init__(file, batch_size)
+        self.workbook = load_workbook(file, read_only=True, data_only=True)
+        self.sheet = self.workbook[sheet_name] if sheet_name else self.workbook.worksheets[0]
+
+    @property
+    def total_rows(self):
+        """Row count from the sheet dimensions, or 0 when the writer didn't record them"""
+        max_row = self.sheet.max_row
+        return max(max_row - 1, 0) if max_row else 0
+
+    def batches(self):
+        rows = self.sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(name).strip() if name is not None else f'Unnamed: {i}'
+            for i, name in enumerate(header)
+        ]
+        width = len(columns)
+
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            # Read-only rows can be ragged when trailing cells are empty
+            batch.append(row[:width] + (None,) * (width - len(row)))
+            if len(batch) == self.batch_size:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns)
+
+    def close(self):
+        self.workbook.close()
+
+class XlsReader(BatchReader):
+    """Legacy .xls workbooks have no streaming parser, so they are loaded whole"""
+    df = None
+
+    def load(self):
+        if self.df is None:
+            self.df = pd.read_excel(self.file, engine='xlrd')
+        return self.df
+
+    @property
+    def total_rows(self):
+        return len(self.load())
+
+    def batches(self):
+        df = self.load()
+        for start in range(0, len(df), self.batch_size):
+            yield df.iloc[start:start + self.batch_size]
+
+class CsvReader(BatchReader):
+    """
+    Chunked pandas C parser. Everything is read as text so identifiers keep
+    leading zeros; the ingest functions already convert numbers and dates.
+    """
+
+    @property
+    def total_rows(self):
+        """
+        Data rows, from one pass of the csv module over the file (quoted
+        fields may span lines, so lines alone would over-count)
+        """
+        text = io.TextIOWrapper(self.file, encoding='utf-8', errors='replace', newline='')
+        try:
+            rows = sum(1 for row in csv.reader(text) if row)
+        finally:
+            text.detach()
+            self.file.seek(0)
+        return max(rows - 1, 0)
+
+    def batches(self):
+        yield from pd.read_csv(self.file, dtype=str, chunksize=self.batch_size,
+                               skipinitialspace=True)
+
+class NdjsonReader(BatchReader):
+    """One JSON object per line, parsed in chunks by pandas' ujson reader"""
+
+    @property
+    def total_rows(self):
+        """Non-blank lines, counted without decoding them"""
+        rows = sum(1 for line in self.file if line.strip())
+        self.file.seek(0)
+        return rows
+
+    def batches(self):
+        # pandas only decodes bytes itself for real files, not upload objects
+        text = io.TextIOWrapper(self.file, encoding='utf-8')
+        try:
+            with pd.read_json(text, lines=True, chunksize=self.batch_size,
+                              dtype=False, convert_dates=False) as reader:
+                yield from reader
+        finally:
+            text.detach()
+
+class ParquetReader(BatchReader):
+    """Reads record batches straight from the row groups; needs pyarrow"""
+
+    def __init__(self, file, batch_size=READ_BATCH_SIZE):
+        super().__init__(file, batch_size)
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError('Parquet uploads require pyarrow to be installed')
+        self.parquet = pq.ParquetFile(file)
+        self.total_rows = self.parquet.metadata.num_rows
+
+    def batches(self):
+        for batch in self.parquet.iter_batches(batch_size=self.batch_size):
+            yield batch.to_pandas()
+
+READERS = {
+    'xlsx': XlsxReader,
+    'xls': XlsReader,
+    'csv': CsvReader,
+    'ndjson': NdjsonReader,
+    'parquet': ParquetReader,
+}
+
+def open_reader(file, file_format, batch_size=READ_BATCH_SIZE):
+    return READERS[file_format](file, batch_size=batch_size)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from django.db.models import F, OuterRef, Subquery
+from apps.amazon_ae.models import AmazonProduct, AmazonOrder, AmazonOrderItem
+from apps.noon_ae.models import NoonProduct, NoonOrder, NoonOrderItem
+from .bulk import BULK_CHUNK_SIZE, chunked
+from .totals import AMAZON_ORDER_TOTALS, NOON_ORDER_TOTALS, recompute_order_totals, refresh_order_totals
+from .versions import bump_data_version
+
+def assign_random_skus(items, sku_field, product_skus, rng):
+    """
+    Point every item of the ``items`` queryset at a uniformly random entry
+    of ``product_skus``. All choices are drawn from ``rng`` in one go, so a
+    seeded generator always gives the same assignment; the writes are one
+    UPDATE per chosen SKU and chunk of item pks.
+    """
+    pks = np.fromiter(items.order_by('pk').values_list('pk', flat=True), dtype='int64')
+    if not len(pks):
+        return 0
+    chosen = np.asarray(product_skus, dtype=object)[rng.integers(len(product_skus), size=len(pks))]
+    for sku, group in pd.Series(pks).groupby(chosen):
+        for chunk in chunked(group.tolist(), BULK_CHUNK_SIZE):
+            items.model.objects.filter(pk__in=chunk).update(**{sku_field: sku})
+    return len(pks)
+
+def product_field(product_model, sku_field, field):
+    """Correlated subquery for ``field`` of the newest product whose SKU matches the item's"""
+    latest = product_model.objects.filter(**{sku_field: OuterRef(sku_field)}).order_by('-pk')
+    return Subquery(latest.values(field)[:1])
+
+def relink_amazon_items(rng, full=False):
+    """
+    Resolve every Amazon order item without a product link (all items with
+    ``full``): items whose SKU matches no product first move onto a random
+    one, then the newest product with the item's SKU is linked and its asin,
+    title and price copied over. Only the orders of those items get their
+    totals recomputed, so the cost follows the number of unlinked items.
+    """
+    items = AmazonOrderItem.objects.all() if full else AmazonOrderItem.objects.filter(product__isnull=True)
+    count = items.count()
+    order_pks = None if full else set(items.values_list('order_id', flat=True))
+
+    skus = list(AmazonProduct.objects.order_by('pk').values_list('sku', flat=True))
+    unmatched = items.exclude(sku__in=AmazonProduct.objects.values('sku'))
+    randomized = assign_random_skus(unmatched, 'sku', skus, rng)
+
+    items.filter(quantity_ordered=0).update(quantity_ordered=1)
+    items.update(
+        product=product_field(AmazonProduct, 'sku', 'pk'),
+        asin=product_field(AmazonProduct, 'sku', 'asin'),
+        title=product_field(AmazonProduct, 'sku', 'title'),
+        item_price_amount=product_field(AmazonProduct, 'sku', 'price'),
+    )
+
+    if full:
+        recompute_order_totals(AmazonOrder, AmazonOrderItem, AMAZON_ORDER_TOTALS)
+    else:
+        refresh_order_totals(AmazonOrder, AmazonOrderItem, order_pks, AMAZON_ORDER_TOTALS)
+    bump_data_version(None, 'amazon')
+    return {'items': count, 'randomized': randomized}
+
+def relink_noon_items(rng, full=False):
+    """Noon counterpart of ``relink_amazon_items``, matching on partner_sku"""
+    items = NoonOrderItem.objects.all() if full else NoonOrderItem.objects.filter(product__isnull=True)
+    count = items.count()
+    order_pks = None if full else set(items.values_list('order_id', flat=True))
+
+    skus = list(NoonProduct.objects.order_by('pk').values_list('partner_sku', flat=True))
+    unmatched = items.exclude(partner_sku__in=NoonProduct.objects.values('partner_sku'))
+    randomized = assign_random_skus(unmatched, 'partner_sku', skus, rng)
+
+    items.filter(quantity=0).update(quantity=1)
+    price = product_field(NoonProduct, 'partner_sku', 'price')
+    items.update(
+        product=product_field(NoonProduct, 'partner_sku', 'pk'),
+        noon_sku=product_field(NoonProduct, 'partner_sku', 'noon_sku'),
+        name=product_field(NoonProduct, 'partner_sku', 'title'),
+        unit_price=price,
+        total_price=price * F('quantity'),
+    )
+
+    if full:
+        recompute_order_totals(NoonOrder, NoonOrderItem, NOON_ORDER_TOTALS)
+    else:
+        refresh_order_totals(NoonOrder, NoonOrderItem, order_pks, NOON_ORDER_TOTALS)
+    bump_data_version(None, 'noon')
+    return {'items': count, 'randomized': randomized}
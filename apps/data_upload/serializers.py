@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from .models import UploadJob
+
+class UploadJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source='id', read_only=True)
+    rows_per_sec = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = UploadJob
+        fields = [
+            'job_id', 'marketplace', 'data_type', 'file_format', 'dry_run', 'state', 'rows_total', 'rows_done',
+            'rows_per_sec', 'chunk_size', 'chunks_committed', 'resumed_from_row', 'result', 'error', 'created_at', 'started_at', 'finished_at',
+        ]
@@ -0,0 +1,218 @@
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .bundle import list_parts, read_parts
+from .ingest import UPLOADERS
+from .models import UploadJob, UploadCheckpoint
+from .readers import open_reader
+from .validate import DryRun
+from .versions import bump_data_version, data_version
+
+# Data types whose rows carry a content hash, so an identical re-upload is a no-op
+HASHED_DATA_TYPES = ['products', 'inventory']
+
+def merge_results(total, result):
+    """Add the counters of one chunk result into the running job result"""
+    for key, value in result.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+def get_checkpoint(job):
+    """
+    Checkpoint to resume from. A file that was fully written before starts
+    over from the first row; a partially written one picks up where the last
+    committed chunk ended.
+    """
+    checkpoint, _ = UploadCheckpoint.objects.get_or_create(
+        user=job.user,
+        marketplace=job.marketplace,
+        data_type=job.data_type,
+        file_hash=job.file_hash,
+    )
+    if checkpoint.completed:
+        checkpoint.rows_committed = 0
+        checkpoint.chunks_committed = 0
+        checkpoint.result = {}
+        checkpoint.completed = False
+        checkpoint.save()
+    return checkpoint
+
+def last_successful_upload(job):
+    """
+    Most recent fully written checkpoint for the job's user, marketplace and
+    data type, provided nothing has written that data since: a later partial
+    upload, an edit or another user's upload taking rows all bump the version.
+    """
+    last = UploadCheckpoint.objects.filter(
+        user=job.user,
+        marketplace=job.marketplace,
+        data_type=job.data_type,
+        completed=True,
+    ).order_by('-updated_at').first()
+    if last and last.data_version == data_version(job.user, job.marketplace):
+        return last
+    return None
+
+def skip_committed(reader, rows):
+    """Drop the first ``rows`` rows from the reader's batches"""
+    for chunk in reader:
+        if rows >= len(chunk):
+            rows -= len(chunk)
+            continue
+        if rows:
+            chunk = chunk.iloc[rows:]
+            rows = 0
+        yield chunk
+
+def run_dry_run(job):
+    """Validate every batch of the file and store the report as the job result"""
+    dry_run = DryRun(job.user, job.marketplace, job.data_type)
+    with job.file.open('rb') as f:
+        reader = open_reader(f, job.file_format, batch_size=job.chunk_size)
+        job.rows_total = reader.total_rows
+        job.save(update_fields=['rows_total'])
+        try:
+            for chunk in reader:
+                dry_run.check(chunk, job.rows_done + 1)
+                job.rows_done += len(chunk)
+                job.save(update_fields=['rows_done'])
+        finally:
+            reader.close()
+    job.result = dry_run.report()
+    # The real run would skip the whole file, so predict that instead
+    last = unchanged_file(job)
+    if last:
+        job.result.update(unchanged_file_result(last))
+    job.save(update_fields=['result'])
+
+def unchanged_file(job):
+    """
+    Checkpoint of the last upload when the job's file is identical to it and
+    nothing has written since, so writing it again would change nothing.
+    """
+    if job.data_type not in HASHED_DATA_TYPES:
+        return None
+    last = last_successful_upload(job)
+    return last if last and last.file_hash == job.file_hash else None
+
+def unchanged_file_result(last):
+    return {
+        'created': 0,
+        'updated': 0,
+        'unchanged': sum(last.result.values()),
+        'file_unchanged': True,
+    }
+
+def run_upload(job):
+    """Write the file chunk by chunk, resuming from the file's checkpoint"""
+    last = unchanged_file(job)
+    if last:
+        job.rows_total = job.rows_done = last.rows_committed
+        job.result = unchanged_file_result(last)
+        job.save(update_fields=['rows_total', 'rows_done', 'result'])
+        return
+
+    upload = UPLOADERS[job.marketplace][job.data_type]
+    checkpoint = get_checkpoint(job)
+    job.resumed_from_row = job.rows_done = checkpoint.rows_committed
+    job.chunks_committed = checkpoint.chunks_committed
+    job.result = checkpoint.result
+
+    with job.file.open('rb') as f:
+        reader = open_reader(f, job.file_format, batch_size=job.chunk_size)
+        job.rows_total = reader.total_rows
+        job.save(update_fields=['rows_total', 'rows_done', 'resumed_from_row', 'chunks_committed', 'result'])
+
+        try:
+            for chunk in skip_committed(reader, checkpoint.rows_committed):
+                first_row = job.rows_done
+                try:
+                    # Data and checkpoint commit together, so after a
+                    # failure the checkpoint still points at this chunk.
+                    with transaction.atomic():
+                        chunk_result = upload(chunk, job.user)
+                        bump_data_version(job.user, job.marketplace)
+                        checkpoint.rows_committed = first_row + len(chunk)
+                        checkpoint.chunks_committed += 1
+                        checkpoint.result = merge_results(dict(job.result), chunk_result)
+                        checkpoint.save(update_fields=['rows_committed', 'chunks_committed', 'result', 'updated_at'])
+                except Exception as e:
+                    raise Exception(f'Rows {first_row + 1}-{first_row + len(chunk)}: {e}')
+
+                job.rows_done = checkpoint.rows_committed
+                job.chunks_committed = checkpoint.chunks_committed
+                job.result = checkpoint.result
+                job.save(update_fields=['rows_done', 'chunks_committed', 'result'])
+        finally:
+            reader.close()
+
+    checkpoint.completed = True
+    checkpoint.data_version = data_version(job.user, job.marketplace)
+    checkpoint.save(update_fields=['completed', 'data_version', 'updated_at'])
+
+def run_bundle(job):
+    """
+    Parse every part of a workbook or zip bundle in parallel and write (or,
+    for a dry run, validate) them chunk by chunk in dependency order. The
+    job result holds one entry per part plus the sheets that were ignored.
+    """
+    path = job.file.path
+    parts, skipped = list_parts(path, job.file_format)
+    if not parts:
+        raise Exception('No products, inventory or orders sheets found in the bundle')
+    job.result = {'skipped_sheets': skipped}
+
+    for marketplace, data_type, df in read_parts(path, job.file_format, parts, settings.UPLOAD_PARSE_WORKERS):
+        name = f'{marketplace}_{data_type}'
+        upload = UPLOADERS[marketplace][data_type]
+        dry_run = DryRun(job.user, marketplace, data_type) if job.dry_run else None
+        job.rows_total += len(df)
+        job.result[name] = {}
+        job.save(update_fields=['rows_total', 'result'])
+
+        for start in range(0, len(df), job.chunk_size):
+            chunk = df.iloc[start:start + job.chunk_size]
+            if dry_run:
+                dry_run.check(chunk, start + 1)
+            else:
+                try:
+                    with transaction.atomic():
+                        merge_results(job.result[name], upload(chunk, job.user))
+                        bump_data_version(job.user, marketplace)
+                except Exception as e:
+                    raise Exception(f'{name} rows {start + 1}-{start + len(chunk)}: {e}')
+            job.rows_done += len(chunk)
+            job.save(update_fields=['rows_done', 'result'])
+
+        if dry_run:
+            job.result[name] = dry_run.report()
+        else:
+            # The data no longer matches any earlier file of this type
+            UploadCheckpoint.objects.filter(
+                user=job.user, marketplace=marketplace, data_type=data_type, completed=True
+            ).delete()
+        job.save(update_fields=['result'])
+
+@shared_task
+def process_upload_job(job_id):
+    job = UploadJob.objects.get(pk=job_id)
+    job.state = 'RUNNING'
+    job.started_at = timezone.now()
+    job.save(update_fields=['state', 'started_at'])
+
+    try:
+        if job.data_type == 'bundle':
+            run_bundle(job)
+        elif job.dry_run:
+            run_dry_run(job)
+        else:
+            run_upload(job)
+        job.state = 'SUCCESS'
+    except Exception as e:
+        job.state = 'FAILURE'
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['state', 'error', 'finished_at'])
+    return str(job.pk)
@@ -0,0 +1,163 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.amazon_ae.models import AmazonOrder, AmazonOrderItem, AmazonProduct
+from apps.authentication.models import MarketplaceCredential
+from .ingest import UPLOADERS
+from .models import UploadJob
+from .readers import file_sha256
+from .totals import AMAZON_ORDER_TOTALS, refresh_order_totals
+from .tasks import process_upload_job
+
+PRODUCT_HEADER = 'asin,sku,title,category,price,quantity\n'
+
+class UploadTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user('seller', password='x')
+
+    def upload(self, marketplace, data_type, content, chunk_size=5000, user=None, dry_run=False, file_format='csv'):
+        file = SimpleUploadedFile(f'data.{file_format}', content.encode())
+        job = UploadJob.objects.create(
+            user=user or self.user,
+            marketplace=marketplace,
+            data_type=data_type,
+            file=file,
+            file_format=file_format,
+            file_hash=file_sha256(file),
+            chunk_size=chunk_size,
+            dry_run=dry_run,
+        )
+        process_upload_job(str(job.pk))
+        job.refresh_from_db()
+        return job
+
+class RowsTotalTests(UploadTestCase):
+    def test_csv(self):
+        content = PRODUCT_HEADER + 'A1,S1,"Two\nlines",Toys,10,1\n\nA2,S2,Two,Toys,5,1\n'
+        job = self.upload('amazon', 'products', content)
+        self.assertEqual((job.rows_total, job.rows_done), (2, 2))
+
+    def test_ndjson(self):
+        content = '{"asin": "A1", "title": "One"}\n\n{"asin": "A2", "title": "Two"}\n'
+        job = self.upload('amazon', 'products', content, file_format='ndjson')
+        self.assertEqual((job.rows_total, job.rows_done), (2, 2))
+
+class FileUnchangedTests(UploadTestCase):
+    first = PRODUCT_HEADER + 'A1,S1,One,Toys,10,1\n'
+    second = PRODUCT_HEADER + 'A1,S1,Changed,Toys,10,1\nA2,S2,Two,Toys,5,1\n'
+
+    def test_identical_reupload_is_skipped(self):
+        self.upload('amazon', 'products', self.first)
+        job = self.upload('amazon', 'products', self.first)
+        self.assertTrue(job.result.get('file_unchanged'))
+
+    def test_reupload_after_partially_failed_upload_is_written(self):
+        self.upload('amazon', 'products', self.first)
+
+        upload = UPLOADERS['amazon']['products']
+        calls = []
+        def fail_second_chunk(df, user):
+            calls.append(df)
+            if len(calls) == 2:
+                raise ValueError('boom')
+            return upload(df, user)
+        with mock.patch.dict(UPLOADERS['amazon'], products=fail_second_chunk):
+            failed = self.upload('amazon', 'products', self.second, chunk_size=1)
+        self.assertEqual(failed.state, 'FAILURE')
+        self.assertEqual(AmazonProduct.objects.get(asin='A1').title, 'Changed')
+
+        job = self.upload('amazon', 'products', self.first)
+        self.assertEqual(job.state, 'SUCCESS')
+        self.assertFalse(job.result.get('file_unchanged'))
+        self.assertEqual(AmazonProduct.objects.get(asin='A1').title, 'One')
+
+    def test_reupload_after_edit_is_written(self):
+        self.upload('amazon', 'products', self.first)
+        product = AmazonProduct.objects.get(asin='A1')
+        product.title = 'Edited'
+        product.save()
+
+        job = self.upload('amazon', 'products', self.first)
+        self.assertFalse(job.result.get('file_unchanged'))
+        self.assertEqual(AmazonProduct.objects.get(asin='A1').title, 'One')
+
+class OrderTotalsTests(UploadTestCase):
+    header = 'amazon_order_id,purchase_date,order_status,order_total_amount,order_item_id,item_sku,quantity_ordered,item_price\n'
+
+    def test_order_that_loses_its_last_item_drops_to_zero(self):
+        self.upload('amazon', 'orders', self.header + 'O1,2024-01-01,Shipped,0,I1,S1,2,10\n')
+        self.assertEqual(AmazonOrder.objects.get(amazon_order_id='O1').order_total_amount, 20)
+
+        self.upload('amazon', 'orders', self.header + 'O2,2024-01-02,Shipped,0,I1,S1,3,10\n')
+        self.assertEqual(AmazonOrder.objects.get(amazon_order_id='O1').order_total_amount, 0)
+        self.assertEqual(AmazonOrder.objects.get(amazon_order_id='O2').order_total_amount, 30)
+
+    def test_order_without_items_keeps_imported_total(self):
+        self.upload('amazon', 'orders', self.header + 'O1,2024-01-01,Shipped,99,,,,\n')
+        self.assertEqual(AmazonOrder.objects.get(amazon_order_id='O1').order_total_amount, 99)
+
+    def test_item_counts_follow_order_status(self):
+        self.upload('amazon', 'orders', self.header + 'O1,2024-01-01,Delivered,0,I1,S1,3,10\nO2,2024-01-01,Pending,0,I2,S1,2,10\n')
+        delivered = AmazonOrder.objects.get(amazon_order_id='O1')
+        self.assertEqual((delivered.number_of_items_shipped, delivered.number_of_items_unshipped), (3, 0))
+        pending = AmazonOrder.objects.get(amazon_order_id='O2')
+        self.assertEqual((pending.number_of_items_shipped, pending.number_of_items_unshipped), (0, 2))
+
+    def test_refresh_bumps_updated_at(self):
+        self.upload('amazon', 'orders', self.header + 'O1,2024-01-01,Shipped,0,I1,S1,2,10\n')
+        long_ago = timezone.now() - timedelta(days=1)
+        AmazonOrder.objects.update(order_total_amount=0, updated_at=long_ago)
+        refresh_order_totals(AmazonOrder, AmazonOrderItem, AmazonOrder.objects.values_list('pk', flat=True), AMAZON_ORDER_TOTALS)
+        order = AmazonOrder.objects.get(amazon_order_id='O1')
+        self.assertEqual(order.order_total_amount, 20)
+        self.assertGreater(order.updated_at, long_ago)
+
+class ReassignedRowsTests(UploadTestCase):
+    def test_upload_taking_rows_retires_previous_owner_cache(self):
+        credential = MarketplaceCredential.objects.create(
+            user=self.user, marketplace='AMAZON_AE', client_id='cid', client_secret='secret')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {credential.generate_access_token()}')
+        self.upload('amazon', 'products', PRODUCT_HEADER + 'A1,S1,One,Toys,10,1\n')
+        first = client.get('/api/amazon-ae/catalog/items/')
+        self.assertEqual(len(first.json()['payload']['items']), 1)
+
+        other = User.objects.create_user('other', password='x')
+        self.upload('amazon', 'products', PRODUCT_HEADER + 'A1,S1,One,Toys,10,1\n', user=other)
+
+        response = client.get('/api/amazon-ae/catalog/items/')
+        self.assertEqual(response.json()['payload']['items'], [])
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(client.get('/api/amazon-ae/catalog/items/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+class DryRunTests(UploadTestCase):
+    first = PRODUCT_HEADER + 'A1,S1,One,Toys,10,1\nA2,S2,Two,Toys,5,1\n'
+
+    def test_predicts_unchanged_rows(self):
+        self.upload('amazon', 'products', self.first)
+        content = PRODUCT_HEADER + 'A1,S1,One,Toys,10,1\nA2,S2,Changed,Toys,5,1\nA3,S3,Three,Toys,5,1\n'
+        report = self.upload('amazon', 'products', content, chunk_size=2, dry_run=True).result
+        result = self.upload('amazon', 'products', content, chunk_size=2).result
+        self.assertEqual(
+            {key: report[key] for key in ('created', 'updated', 'unchanged')},
+            {'created': 1, 'updated': 1, 'unchanged': 1},
+        )
+        self.assertEqual({key: report[key] for key in result}, result)
+
+    def test_predicts_unchanged_file(self):
+        self.upload('amazon', 'products', self.first)
+        report = self.upload('amazon', 'products', self.first, dry_run=True).result
+        self.assertTrue(report['dry_run'])
+        self.assertTrue(report['file_unchanged'])
+        self.assertEqual(report['unchanged'], 2)
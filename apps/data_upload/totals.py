@@ -0,0 +1,79 @@
+from decimal import Decimal
+from django.db.models import Case, DecimalField, Exists, F, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Abs, Coalesce
+from django.utils import timezone
+from apps.amazon_ae.models import AmazonOrder
+from .bulk import BULK_CHUNK_SIZE, chunked
+
+# Order field -> aggregate over the order's items. The models' own
+# order_totals() are the per-item equivalents used by save() and delete().
+AMAZON_ORDER_TOTALS = {
+    'order_total_amount': Sum(F('item_price_amount') * F('quantity_ordered'), output_field=DecimalField()),
+    'number_of_items_shipped': Sum(Case(When(order__order_status__in=AmazonOrder.SHIPPED_STATUSES, then=F('quantity_ordered')), default=Value(0))),
+    'number_of_items_unshipped': Sum(Case(When(order__order_status__in=AmazonOrder.UNSHIPPED_STATUSES, then=F('quantity_ordered')), default=Value(0))),
+}
+
+NOON_ORDER_TOTALS = {
+    'total_amount': Sum('total_price'),
+    'items_order_quantity': Sum('quantity'),
+}
+
+# Rounding slack when comparing stored amounts to summed ones
+TOLERANCE = Decimal('0.005')
+
+def item_totals(item_model, totals):
+    """
+    Correlated subqueries computing ``totals`` for use in an order
+    ``update()``. Orders without items get NULL.
+    """
+    return {
+        field: Subquery(
+            item_model.objects.filter(order=OuterRef('pk'))
+            .values('order')
+            .annotate(value=aggregate)
+            .values('value')
+        )
+        for field, aggregate in totals.items()
+    }
+
+def refresh_order_totals(order_model, item_model, order_pks, totals, emptied_pks=()):
+    """
+    Recompute ``totals`` for the given orders with one UPDATE ... SET
+    field = (SELECT ...) per chunk. Orders without items keep their values,
+    except those in ``emptied_pks`` (orders items were moved away from),
+    which drop to 0 once their last item is gone.
+    """
+    values = item_totals(item_model, totals)
+    has_items = Exists(item_model.objects.filter(order=OuterRef('pk')))
+    # update() skips auto_now, and LastUpdatedAfter polls rely on it
+    now = timezone.now()
+    for chunk in chunked(sorted(order_pks), BULK_CHUNK_SIZE):
+        order_model.objects.filter(has_items, pk__in=chunk).update(updated_at=now, **values)
+    for chunk in chunked(sorted(emptied_pks), BULK_CHUNK_SIZE):
+        order_model.objects.filter(~has_items, pk__in=chunk).update(updated_at=now, **{field: 0 for field in totals})
+
+def recompute_order_totals(order_model, item_model, totals):
+    """Recompute ``totals`` for every order in a single UPDATE; orders without items get 0"""
+    order_model.objects.update(updated_at=timezone.now(), **{
+        field: Coalesce(subquery, Value(0), output_field=order_model._meta.get_field(field))
+        for field, subquery in item_totals(item_model, totals).items()
+    })
+
+def stale_orders(order_model, item_model, totals):
+    """
+    Pks of the orders whose stored totals differ from the aggregate of
+    their items, from one grouped query over the items table. Orders
+    without items are not checked.
+    """
+    annotations = {}
+    stale = Q()
+    for field, aggregate in totals.items():
+        stored = Coalesce(Max(f'order__{field}'), Value(0), output_field=order_model._meta.get_field(field))
+        annotations[f'{field}_diff'] = Abs(aggregate - stored)
+        stale |= Q(**{f'{field}_diff__gt': TOLERANCE})
+    return list(
+        item_model.objects.values('order')
+        .annotate(**annotations)
+        .filter(stale)
+        .values_list('order', flat=True)
+    )
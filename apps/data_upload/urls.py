@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path('amazon/', views.upload_amazon_data, name='upload_amazon_data'),
     path('noon/', views.upload_noon_data, name='upload_noon_data'),
+    path('bundle/', views.upload_bundle, name='upload_bundle'),
+    path('jobs/<uuid:job_id>/', views.upload_job_status, name='upload_job_status'),
     path('clear-db/', views.clear_database, name='clear_database'),
     path('fix-relationships/', views.fix_relationships, name='fix_relationships'),
 ]
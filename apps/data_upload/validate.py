@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from apps.amazon_ae.models import AmazonProduct, AmazonOrder, AmazonOrderItem, AmazonInventory
+from apps.noon_ae.models import NoonProduct, NoonOrder, NoonOrderItem, NoonInventory
+from apps.common.models import RowHashModel
+from .bulk import load_existing_keys
+from .ingest import (
+    AMAZON_PRODUCT_COLUMNS, AMAZON_ORDER_COLUMNS, AMAZON_ORDER_ITEM_COLUMNS, AMAZON_INVENTORY_COLUMNS,
+    NOON_PRODUCT_COLUMNS, NOON_ORDER_COLUMNS, NOON_ORDER_ITEM_COLUMNS, NOON_INVENTORY_COLUMNS,
+    keyed_rows,
+)
+from .normalize import DATE_FORMAT, normalize
+
+MAX_REPORTED_ERRORS = 1000
+
+# (count prefix, model, column spec, scoped to the uploading user). The first
+# entry's key is required on every row; later entries are optional per row.
+DRY_RUN_SPECS = {
+    'amazon': {
+        'products': [('', AmazonProduct, AMAZON_PRODUCT_COLUMNS, False)],
+        'orders': [
+            ('orders_', AmazonOrder, AMAZON_ORDER_COLUMNS, False),
+            ('items_', AmazonOrderItem, AMAZON_ORDER_ITEM_COLUMNS, False),
+        ],
+        'inventory': [('', AmazonInventory, AMAZON_INVENTORY_COLUMNS, True)],
+    },
+    'noon': {
+        'products': [('', NoonProduct, NOON_PRODUCT_COLUMNS, False)],
+        'orders': [
+            ('orders_', NoonOrder, NOON_ORDER_COLUMNS, False),
+            ('items_', NoonOrderItem, NOON_ORDER_ITEM_COLUMNS, False),
+        ],
+        'inventory': [('', NoonInventory, NOON_INVENTORY_COLUMNS, True)],
+    },
+}
+
+def column_problems(raw, kind):
+    """Boolean masks of rows the real upload would silently default, keyed by reason"""
+    present = raw.notna()
+    if kind in ('num', 'int', 'optional_num'):
+        return {'not a number': present & pd.to_numeric(raw, errors='coerce').isna()}
+    if kind == 'date':
+        parsed = pd.to_datetime(raw, format=DATE_FORMAT, errors='coerce')
+        return {
+            'missing date, would default to upload time': ~present,
+            f'invalid date, expected {DATE_FORMAT}': present & parsed.isna(),
+        }
+    return {}
+
+class DryRun:
+    """
+    Validates upload batches without writing anything and predicts the
+    counts the real upload would report. Feed batches in file order.
+    """
+
+    def __init__(self, user, marketplace, data_type):
+        self.user = user
+        self.specs = DRY_RUN_SPECS[marketplace][data_type]
+        self.errors = []
+        self.error_count = 0
+        self.counts = {}
+        # Key -> row hash of the last row written, per spec, for keys seen in earlier batches
+        self.seen = [{} for _ in self.specs]
+        self.missing_columns = None
+
+    def add_errors(self, mask, first_row, column, reason):
+        positions = np.flatnonzero(mask.to_numpy())
+        self.error_count += len(positions)
+        room = MAX_REPORTED_ERRORS - len(self.errors)
+        for position in positions[:max(room, 0)]:
+            self.errors.append({'row': first_row + int(position), 'column': column, 'reason': reason})
+
+    def check(self, df, first_row):
+        """Validate one batch whose first data row is ``first_row`` (1-based)"""
+        df = df.reset_index(drop=True)
+        required = None
+        if self.missing_columns is None:
+            self.missing_columns = [
+                source for _, _, columns, _ in self.specs
+                for source, _, _ in columns.values() if source not in df.columns
+            ]
+
+        for i, (prefix, model, columns, scoped) in enumerate(self.specs):
+            key_field, (key_column, _, _) = next(iter(columns.items()))
+            keys = normalize(df, {key_field: columns[key_field]})[key_field]
+            if required is None:
+                required = keys != ''
+                self.add_errors(~required, first_row, key_column, f'missing {key_column}')
+            rows = required & (keys != '')
+
+            for source, kind, _ in list(columns.values())[1:]:
+                if source in df.columns:
+                    for reason, mask in column_problems(df[source], kind).items():
+                        self.add_errors(mask & rows, first_row, source, reason)
+
+            if issubclass(model, RowHashModel):
+                hashes = [(key, values['row_hash']) for key, values in keyed_rows(df[rows.to_numpy()], columns, self.user)]
+                self.count(i, prefix, model, key_field, hashes, scoped, hashed=True)
+            else:
+                self.count(i, prefix, model, key_field, [(key, None) for key in keys[rows].tolist()], scoped)
+
+    def count(self, i, prefix, model, key_field, rows, scoped, hashed=False):
+        """
+        Add the counts ``bulk_upsert`` would report for one batch of (key,
+        row hash) pairs: with ``hashed``, keys whose last written hash equals
+        the batch's are unchanged.
+        """
+        seen = self.seen[i]
+        latest = dict(rows)
+        fresh = [key for key in latest if key not in seen]
+        scope = {'user': self.user} if scoped else None
+        existing = load_existing_keys(model, key_field, fresh, scope=scope, with_hash=hashed)
+        created = sum(1 for key in fresh if key not in existing)
+        unchanged = 0
+        if hashed:
+            stored = {**{key: row_hash for key, (_, row_hash) in existing.items()}, **seen}
+            unchanged = sum(1 for key, row_hash in latest.items() if stored.get(key) == row_hash)
+            self.counts[f'{prefix}unchanged'] = self.counts.get(f'{prefix}unchanged', 0) + unchanged
+        seen.update(latest)
+
+        self.counts[f'{prefix}created'] = self.counts.get(f'{prefix}created', 0) + created
+        self.counts[f'{prefix}updated'] = self.counts.get(f'{prefix}updated', 0) + len(rows) - created - unchanged
+
+    def report(self):
+        return {
+            'dry_run': True,
+            **self.counts,
+            'missing_columns': self.missing_columns or [],
+            'error_count': self.error_count,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'errors_truncated': self.error_count > len(self.errors),
+        }
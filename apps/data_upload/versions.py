@@ -0,0 +1,38 @@
+from django.db.models import F
+from django.utils import timezone
+from .models import DataVersion
+
+def get_data_version(user, marketplace):
+    """``DataVersion`` row of ``user``'s ``marketplace`` data"""
+    # Creating the row on first read means a global bump reaches every
+    # user who could have cached something.
+    version, _ = DataVersion.objects.get_or_create(user=user, marketplace=marketplace)
+    return version
+
+def data_version(user, marketplace):
+    """Current write version of ``user``'s ``marketplace`` data"""
+    return get_data_version(user, marketplace).version
+
+def bump_data_version(user, marketplace):
+    """
+    Invalidate everything cached for ``user``'s ``marketplace`` data, or for
+    every user when ``user`` is None. Call it inside the transaction that
+    writes, so readers never pair new data with an old version.
+    """
+    now = timezone.now()
+    versions = DataVersion.objects.filter(marketplace=marketplace)
+    if user is None:
+        versions.update(version=F('version') + 1, updated_at=now)
+        return
+    if not versions.filter(user=user).update(version=F('version') + 1, updated_at=now):
+        DataVersion.objects.get_or_create(user=user, marketplace=marketplace, defaults={'version': 1, 'updated_at': now})
+
+
+def bump_data_versions(user_ids, marketplace):
+    """
+    ``bump_data_version`` for every user in ``user_ids`` in one UPDATE. Users
+    without a version row have never read one, so there is nothing to retire.
+    """
+    if user_ids:
+        DataVersion.objects.filter(marketplace=marketplace, user_id__in=user_ids).update(
+            version=F('version') + 1, updated_at=timezone.now())
@@ -0,0 +1,82 @@
+from django.db import connection, models, transaction
+from apps.amazon_ae.models import AmazonProduct, AmazonOrder, AmazonOrderItem, AmazonInventory
+from apps.noon_ae.models import NoonProduct, NoonOrder, NoonOrderItem, NoonInventory
+from .models import UploadCheckpoint
+from .versions import bump_data_version
+
+WIPE_CHUNK_SIZE = 5000
+
+# (model, lookup from the model to its owning user), children before
+# parents so no DELETE ever has to cascade.
+WIPE_TABLES = {
+    'amazon': [
+        (AmazonOrderItem, 'order__user'),
+        (AmazonOrder, 'user'),
+        (AmazonInventory, 'user'),
+        (AmazonProduct, 'user'),
+    ],
+    'noon': [
+        (NoonOrderItem, 'order__user'),
+        (NoonOrder, 'user'),
+        (NoonInventory, 'user'),
+        (NoonProduct, 'user'),
+    ],
+}
+
+def delete_in_chunks(queryset, chunk_size=WIPE_CHUNK_SIZE):
+    """
+    Raw DELETE of every row in ``queryset`` by primary key, one transaction
+    per chunk so readers (and SQLite's single writer lock) get a turn
+    between chunks. Skips the ORM collector entirely: callers must delete
+    dependent rows first.
+    """
+    model = queryset.model
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+
+    deleted = 0
+    while True:
+        chunk = list(pks[:chunk_size])
+        if not chunk:
+            return deleted
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({", ".join(["%s"] * len(chunk))})', chunk)
+        deleted += len(chunk)
+
+def unlink_references(queryset):
+    """Clear SET_NULL foreign keys from other tables that point into ``queryset``"""
+    for relation in queryset.model._meta.related_objects:
+        if relation.on_delete is models.SET_NULL:
+            field = relation.field.name
+            relation.related_model.objects.filter(**{f'{field}__in': queryset.values('pk')}).update(**{field: None})
+
+def wipe_marketplace_data(user=None, marketplaces=('amazon', 'noon'), chunk_size=WIPE_CHUNK_SIZE):
+    """
+    Delete the orders, items, inventory and products of ``marketplaces``,
+    for ``user`` only or for everyone, plus the matching upload checkpoints.
+
+    A global wipe on Postgres is a single TRUNCATE; everything else is
+    chunked raw DELETEs in FK-safe order. Returns rows deleted per model.
+    """
+    tables = [entry for marketplace in marketplaces for entry in WIPE_TABLES[marketplace]]
+    deleted = {}
+
+    if user is None and connection.vendor == 'postgresql':
+        deleted = {model._meta.label: model.objects.count() for model, _ in tables}
+        names = ', '.join(connection.ops.quote_name(model._meta.db_table) for model, _ in tables)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE TABLE {names}')
+    else:
+        for model, user_lookup in tables:
+            queryset = model.objects.all() if user is None else model.objects.filter(**{user_lookup: user})
+            unlink_references(queryset)
+            deleted[model._meta.label] = delete_in_chunks(queryset, chunk_size)
+
+    checkpoints = UploadCheckpoint.objects.filter(marketplace__in=marketplaces)
+    if user is not None:
+        checkpoints = checkpoints.filter(user=user)
+    checkpoints.delete()
+    for marketplace in marketplaces:
+        bump_data_version(user, marketplace)
+    return deleted
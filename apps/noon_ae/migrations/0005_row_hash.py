@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('noon_ae', '0004_noonorder_automated_shipping_settings_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nooninventory',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='noonproduct',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('noon_ae', '0007_order_item_product'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='noonorder',
+            index=models.Index(fields=['user', 'order_date', 'id'], name='noon_order_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='noonproduct',
+            index=models.Index(fields=['user', 'id'], name='noon_product_user_id_idx'),
+        ),
+    ]
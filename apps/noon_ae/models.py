@@ -1,10 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
+from decimal import Decimal
+from apps.common.models import DataVersionModel, OrderItemTotalsModel, RowHashModel
+
+class NoonProduct(RowHashModel):
+    data_version_marketplace = 'noon'
 
-class NoonProduct(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='noon_products')
     noon_sku = models.CharField(max_length=100, unique=True)
-    partner_sku = models.CharField(max_length=100)
+    partner_sku = models.CharField(max_length=100, db_index=True)
     title = models.CharField(max_length=500)
     title_ar = models.CharField(max_length=500, blank=True)
     summary = models.TextField(blank=True)
@@ -55,10 +59,18 @@ class NoonProduct(models.Model):
     marketplace_ids = models.JSONField(default=list, blank=True)
     variant_group_info = models.JSONField(default=dict, blank=True)
 
+    class Meta:
+        indexes = [
+            # Product list cursor pages: WHERE user_id = ? AND id > ? ORDER BY id
+            models.Index(fields=['user', 'id'], name='noon_product_user_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.noon_sku} - {self.title}"
 
-class NoonOrder(models.Model):
+class NoonOrder(DataVersionModel):
+    data_version_marketplace = 'noon'
+
     ORDER_STATUS_CHOICES = [
         ('placed', 'Placed'),
         ('confirmed', 'Confirmed'),
@@ -114,11 +126,21 @@ class NoonOrder(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     raw_data = models.JSONField(default=dict)
 
+    class Meta:
+        indexes = [
+            # Order list cursor pages, newest first
+            models.Index(fields=['user', 'order_date', 'id'], name='noon_order_user_date_idx'),
+        ]
+
     def __str__(self):
         return self.order_nr
 
-class NoonOrderItem(models.Model):
+class NoonOrderItem(OrderItemTotalsModel):
+    data_version_marketplace = 'noon'
+
     order = models.ForeignKey(NoonOrder, on_delete=models.CASCADE, related_name='items')
+    # Product the partner SKU resolved to; NULL until the next relationship repair
+    product = models.ForeignKey(NoonProduct, on_delete=models.SET_NULL, null=True, blank=True, related_name='order_items')
     order_item_id = models.CharField(max_length=50, unique=True)
     noon_sku = models.CharField(max_length=100)
     partner_sku = models.CharField(max_length=100)
@@ -142,7 +164,15 @@ class NoonOrderItem(models.Model):
     def __str__(self):
         return f"{self.order_item_id} - {self.name}"
 
-class NoonInventory(models.Model):
+    def order_totals(self):
+        return {
+            'total_amount': Decimal(str(self.total_price or 0)),
+            'items_order_quantity': int(self.quantity or 0),
+        }
+
+class NoonInventory(RowHashModel):
+    data_version_marketplace = 'noon'
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='noon_inventory')
     noon_sku = models.CharField(max_length=100)
     partner_sku = models.CharField(max_length=100)
@@ -4,11 +4,11 @@ from .models import NoonProduct, NoonOrder, NoonOrderItem, NoonInventory
 class NoonProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = NoonProduct
-        fields = '__all__'
+        exclude = ['row_hash']
 class NoonOrderItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = NoonOrderItem
-        fields = '__all__'
+        exclude = ['product']
 
 class NoonOrderSerializer(serializers.ModelSerializer):
     items = NoonOrderItemSerializer(many=True, read_only=True)
@@ -20,4 +20,4 @@ class NoonOrderSerializer(serializers.ModelSerializer):
 class NoonInventorySerializer(serializers.ModelSerializer):
     class Meta:
         model = NoonInventory
-        fields = '__all__'
\ No newline at end of file
+        exclude = ['row_hash']
\ No newline at end of file
@@ -4,14 +4,57 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied # Required for security check
 from rest_framework.filters import SearchFilter
+from django.db.models import Prefetch
 from .models import NoonProduct, NoonOrder, NoonOrderItem, NoonInventory
 from .serializers import (
     NoonProductSerializer, NoonOrderSerializer,
     NoonOrderItemSerializer, NoonInventorySerializer
 )
+from apps.data_upload.models import UploadCheckpoint
+from apps.data_upload.versions import bump_data_version, get_data_version
+from apps.common.views import ConditionalGetMixin
+from apps.common.pagination import cached_count, decode_token, encode_token, keyset_page
 from datetime import datetime
 
-class NoonProductViewSet(viewsets.ReadOnlyModelViewSet):
+# Indexed list orderings, each ending in a unique column per user
+PRODUCT_ORDERING = ['id']
+ORDER_ORDERING = ['-order_date', '-id']
+INVENTORY_ORDERING = ['partner_sku']
+
+# Columns each list emits, so pages skip raw_data and other unused fields
+PRODUCT_LIST_FIELDS = ['id', 'partner_sku', 'noon_sku', 'title', 'brand', 'price', 'stock_quantity', 'status']
+ORDER_LIST_FIELDS = ['id', 'order_nr', 'order_date', 'status', 'customer_first_name', 'customer_last_name', 'total_amount']
+ORDER_ITEM_LIST_FIELDS = ['order', 'order_item_id', 'partner_sku', 'name', 'quantity', 'total_price']
+INVENTORY_LIST_FIELDS = ['partner_sku', 'quantity']
+
+def invalid_parameter(message):
+    return {'success': False, 'error': {'code': 'INVALID_PARAMETER', 'message': message}}
+
+def paginate(request, queryset, ordering, default_limit=50):
+    """
+    One page of ``queryset`` plus its pagination block. ``cursor`` seeks
+    straight to the next page; ``page`` is the legacy OFFSET mode and gets
+    slower the deeper it goes. Both return ``next_cursor``.
+    """
+    limit = int(request.query_params.get('limit', default_limit))
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    cursor = request.query_params.get('cursor')
+    pagination = {}
+    if cursor:
+        rows, last = keyset_page(queryset, ordering, limit, after=decode_token(cursor))
+    else:
+        page = int(request.query_params.get('page', 1))
+        if page < 1:
+            raise ValueError('page must be at least 1')
+        rows, last = keyset_page(queryset, ordering, limit, offset=(page - 1) * limit)
+        pagination['page'] = page
+    pagination['next_cursor'] = encode_token(last) if last else None
+    pagination['total_items'] = cached_count(queryset, get_data_version(request.user, 'noon'))
+    return rows, pagination
+
+class NoonProductViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    data_version_marketplace = 'noon'
     serializer_class = NoonProductSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [SearchFilter]
@@ -26,22 +69,23 @@ class NoonProductViewSet(viewsets.ReadOnlyModelViewSet):
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        page = int(request.query_params.get('page', 1))
-        limit = int(request.query_params.get('limit', 50))
-        offset = (page - 1) * limit
-        products = queryset[offset:offset + limit]
+        try:
+            products, pagination = paginate(request, queryset.values(*PRODUCT_LIST_FIELDS), PRODUCT_ORDERING)
+        except ValueError as e:
+            return Response(invalid_parameter(str(e)), status=status.HTTP_400_BAD_REQUEST)
         
         formatted_products = []
         for p in products:
             formatted_products.append({
-                'sku': p.partner_sku, 'noon_sku': p.noon_sku, 'name': p.title,
-                'brand': p.brand, 'price': {'currency': 'AED', 'value': float(p.price)},
-                'stock': {'quantity': p.stock_quantity}, 'status': p.status
+                'sku': p['partner_sku'], 'noon_sku': p['noon_sku'], 'name': p['title'],
+                'brand': p['brand'], 'price': {'currency': 'AED', 'value': float(p['price'])},
+                'stock': {'quantity': p['stock_quantity']}, 'status': p['status']
             })
         
-        return Response({'success': True, 'data': {'products': formatted_products, 'pagination': {'page': page, 'total_items': queryset.count()}}})
+        return Response({'success': True, 'data': {'products': formatted_products, 'pagination': pagination}})
 
-class NoonOrderViewSet(viewsets.ReadOnlyModelViewSet):
+class NoonOrderViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    data_version_marketplace = 'noon'
     serializer_class = NoonOrderSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'order_nr'
@@ -51,14 +95,16 @@ class NoonOrderViewSet(viewsets.ReadOnlyModelViewSet):
         if self.request.auth.marketplace != 'NOON_AE':
             raise PermissionDenied("This token is restricted to Noon AE endpoints.")
             
-        return NoonOrder.objects.filter(user=self.request.user).prefetch_related('items').order_by('-order_date')
+        return NoonOrder.objects.filter(user=self.request.user).prefetch_related('items').order_by(*ORDER_ORDERING)
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        page = int(request.query_params.get('page', 1))
-        limit = int(request.query_params.get('limit', 50))
-        offset = (page - 1) * limit
-        orders = queryset[offset:offset + limit]
+        try:
+            orders, pagination = paginate(request, queryset.only(*ORDER_LIST_FIELDS).prefetch_related(None).prefetch_related(
+                Prefetch('items', queryset=NoonOrderItem.objects.only(*ORDER_ITEM_LIST_FIELDS))
+            ), ORDER_ORDERING)
+        except ValueError as e:
+            return Response(invalid_parameter(str(e)), status=status.HTTP_400_BAD_REQUEST)
         
         formatted_orders = []
         for o in orders:
@@ -72,9 +118,10 @@ class NoonOrderViewSet(viewsets.ReadOnlyModelViewSet):
                 'payment': {'total': {'value': float(o.total_amount)}}, 'items': items
             })
         
-        return Response({'success': True, 'data': {'orders': formatted_orders, 'pagination': {'page': page, 'total_items': queryset.count()}}})
+        return Response({'success': True, 'data': {'orders': formatted_orders, 'pagination': pagination}})
 
-class NoonInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class NoonInventoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    data_version_marketplace = 'noon'
     serializer_class = NoonInventorySerializer
     permission_classes = [IsAuthenticated]
     
@@ -87,11 +134,14 @@ class NoonInventoryViewSet(viewsets.ReadOnlyModelViewSet):
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        items = queryset[:100]
+        try:
+            items, pagination = paginate(request, queryset.values(*INVENTORY_LIST_FIELDS), INVENTORY_ORDERING, default_limit=100)
+        except ValueError as e:
+            return Response(invalid_parameter(str(e)), status=status.HTTP_400_BAD_REQUEST)
         formatted = []
         for i in items:
-            formatted.append({'sku': i.partner_sku, 'stock': {'available': i.quantity}})
-        return Response({'success': True, 'data': {'inventory': formatted, 'pagination': {'total_items': queryset.count()}}})
+            formatted.append({'sku': i['partner_sku'], 'stock': {'available': i['quantity']}})
+        return Response({'success': True, 'data': {'inventory': formatted, 'pagination': pagination}})
 
     @action(detail=False, methods=['post'], url_path='update')
     def update_stock(self, request):
@@ -109,4 +159,9 @@ class NoonInventoryViewSet(viewsets.ReadOnlyModelViewSet):
                 results.append({'sku': inv.partner_sku, 'status': 'success'})
             except:
                 results.append({'sku': update.get('sku'), 'status': 'error'})
+        # Stock now differs from the last inventory sheet, so it must not be skipped as unchanged
+        UploadCheckpoint.objects.filter(
+            user=request.user, marketplace='noon', data_type='inventory', completed=True
+        ).delete()
+        bump_data_version(request.user, 'noon')
         return Response({'success': True, 'data': {'results': results}})
\ No newline at end of file
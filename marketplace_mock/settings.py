@@ -68,6 +68,18 @@ DATABASES = {
     }
 }
 
+# Local memory unless CACHE_URL points at redis; cached entries are keyed by
+# data version, so a per-process cache is still never stale.
+CACHE_URL = config('CACHE_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    } if CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -100,6 +112,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
@@ -110,4 +126,25 @@ SPECTACULAR_SETTINGS = {
     'TITLE': 'Marketplace Mock API',
     'DESCRIPTION': 'Mock API for Amazon AE and Noon AE',
     'VERSION': '1.0.0',
-}
\ No newline at end of file
+}
+# Celery Settings
+# Upload jobs go to a worker through CELERY_BROKER_URL. Eager mode runs them
+# inline instead and is only the default for DEBUG (local and test) runs.
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=DEBUG, cast=bool)
+CELERY_TASK_IGNORE_RESULT = True
+
+# Rows written per transaction by upload jobs; also the resume granularity
+UPLOAD_CHUNK_SIZE = config('UPLOAD_CHUNK_SIZE', default=5000, cast=int)
+# Processes used to parse the sheets of a bundle upload; 1 parses them inline
+UPLOAD_PARSE_WORKERS = config('UPLOAD_PARSE_WORKERS', default=os.cpu_count() or 1, cast=int)
+# Seconds a list's total count is reused while its data version is unchanged;
+# writes that bypass the version (raw SQL) show up after at most this long
+COUNT_CACHE_TIMEOUT = config('COUNT_CACHE_TIMEOUT', default=300, cast=int)
+# Seconds a rendered GET response is reused while its data version is
+# unchanged; 0 disables the response cache
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+# Per-process cache of authenticated bearer tokens: entries and seconds each
+# is trusted before the credential is read again (0 disables it)
+TOKEN_CACHE_SIZE = config('TOKEN_CACHE_SIZE', default=10000, cast=int)
+TOKEN_CACHE_TTL = config('TOKEN_CACHE_TTL', default=60, cast=int)
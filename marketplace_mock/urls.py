@@ -1,18 +1,27 @@
 from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from apps.common.views import response_cache_stats
 
 
 def health_check(request):
     return JsonResponse({"status": "awake", "database": "active"})
 
 
+# Hit rates and key counts are operational detail, so staff only
+@staff_member_required
+def cache_stats(request):
+    return JsonResponse({"response_cache": response_cache_stats(), "timeout": settings.RESPONSE_CACHE_TIMEOUT})
+
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('health/', health_check, name='health_check'),
+    path('cache-stats/', cache_stats, name='cache_stats'),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'),
          name='swagger-ui'),
@@ -7,6 +7,7 @@ django.setup()
 
 from apps.amazon_ae.models import AmazonOrder, AmazonOrderItem, AmazonProduct, AmazonInventory
 from apps.noon_ae.models import NoonOrder, NoonOrderItem, NoonProduct, NoonInventory
+from apps.data_upload.versions import bump_data_version
 
 @transaction.atomic
 def transform_data_realistic():
@@ -86,6 +87,10 @@ def transform_data_realistic():
         count += 1
     print(f"   - Modified {count} Noon Products")
 
+    # The inventory and order item updates above bypass save()
+    bump_data_version(None, 'amazon')
+    bump_data_version(None, 'noon')
+
     print("\n✅ LOCAL DATA TRANSFORMED SUCCESSFULLY!")
 
 if __name__ == "__main__":
@@ -3,6 +3,14 @@
 echo "🏗️ Starting Auto-Restore Process..."
 python manage.py restore_sandbox
 
-# 2. Start the web server
+# 2. Start the upload worker, with a local redis unless a broker is configured
+echo "⚙️ Starting Celery worker..."
+export CELERY_TASK_ALWAYS_EAGER=False
+if [ -z "$CELERY_BROKER_URL" ]; then
+    redis-server --daemonize yes
+fi
+celery -A marketplace_mock worker --loglevel=info &
+
+# 3. Start the web server
 echo "🚀 Starting Gunicorn server..."
 gunicorn marketplace_mock.wsgi:application --bind 0.0.0.0:8000
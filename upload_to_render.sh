@@ -8,17 +8,11 @@ DATA_DIR="render_upload_files"
 
 echo "🚀 Uploading data to LIVE RENDER SERVER..."
 
-# 1. Amazon Products
-curl -X POST $API_URL/api/upload/amazon/ -H "Authorization: Bearer $TOKEN" -F "file=@$DATA_DIR/amazon_products.xlsx" -F "data_type=products"
-# 2. Amazon Orders
-curl -X POST $API_URL/api/upload/amazon/ -H "Authorization: Bearer $TOKEN" -F "file=@$DATA_DIR/amazon_orders.xlsx" -F "data_type=orders"
-# 3. Amazon Inventory
-curl -X POST $API_URL/api/upload/amazon/ -H "Authorization: Bearer $TOKEN" -F "file=@$DATA_DIR/amazon_inventory.xlsx" -F "data_type=inventory"
-# 4. Noon Products
-curl -X POST $API_URL/api/upload/noon/ -H "Authorization: Bearer $TOKEN" -F "file=@$DATA_DIR/noon_products.xlsx" -F "data_type=products"
-# 5. Noon Orders
-curl -X POST $API_URL/api/upload/noon/ -H "Authorization: Bearer $TOKEN" -F "file=@$DATA_DIR/noon_orders.xlsx" -F "data_type=orders"
-# 6. Noon Inventory
-curl -X POST $API_URL/api/upload/noon/ -H "Authorization: Bearer $TOKEN" -F "file=@$DATA_DIR/noon_inventory.xlsx" -F "data_type=inventory"
+# All six files go up as one zip; the server parses them in parallel and
+# writes products, then inventory, then orders
+BUNDLE=$(mktemp -d)/bundle.zip
+python -m zipfile -c $BUNDLE $DATA_DIR/*.xlsx
+curl -X POST $API_URL/api/upload/bundle/ -H "Authorization: Bearer $TOKEN" -F "file=@$BUNDLE"
+rm -f $BUNDLE
 
 echo -e "\n\n✅ Live Upload Complete!"